@@ -1,5 +1,7 @@
 import asyncio
 
+import loop_bootstrap
+
 
 async def foo():
     await asyncio.sleep(0)
@@ -13,5 +15,5 @@ async def main():
 
 
 if __name__ == '__main__':
-    r = asyncio.run(main())
+    r = loop_bootstrap.run(main())
     print(f"Result = {r}")
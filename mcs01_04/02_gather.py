@@ -3,6 +3,8 @@ from time import sleep, time, perf_counter
 
 from faker import Faker
 
+import loop_bootstrap
+
 fake = Faker("uk-UA")  # en-GB
 
 
@@ -32,6 +34,6 @@ if __name__ == "__main__":
     print(perf_counter() - start)
 
     start = perf_counter()
-    users = asyncio.run(main())
+    users = loop_bootstrap.run(main())
     print(users)
     print(perf_counter() - start)
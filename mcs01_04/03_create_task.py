@@ -3,6 +3,8 @@ from time import sleep, time
 
 from faker import Faker
 
+import loop_bootstrap
+
 fake = Faker("uk-UA")  # en-GB
 
 # Awaitable
@@ -29,8 +31,7 @@ async def main():
 if __name__ == "__main__":
     start = time()
     # users = asyncio.run(main())
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    loop = loop_bootstrap.new_loop()
     users = loop.run_until_complete(main())
     print(users)
     print(time() - start)
@@ -1,6 +1,9 @@
 import asyncio
 import random
 
+import loop_bootstrap
+from loop_monitor import LoopLagMonitor
+
 
 async def ping(signal):
     await asyncio.sleep(0)
@@ -20,8 +23,9 @@ async def main():
 
 if __name__ == "__main__":
     # asyncio.run(main())
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    loop = loop_bootstrap.new_loop()
     loop.create_task(main())
     loop.create_task(boo())
+    monitor = LoopLagMonitor(interval=0.1, threshold=0.05)
+    loop.create_task(monitor.run())
     loop.run_forever()
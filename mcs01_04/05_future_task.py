@@ -2,6 +2,7 @@ import asyncio
 
 from faker import Faker
 
+import loop_bootstrap
 from timing import async_timed
 
 fake = Faker("uk-UA")  # en-GB
@@ -49,5 +50,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    users = asyncio.run(main())
+    users = loop_bootstrap.run(main())
     print(users)
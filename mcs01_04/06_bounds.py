@@ -1,5 +1,9 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+import loop_bootstrap
+from power_sums import calculate
+from process_pool import warm_up, run_in_pool, map_chunked, aclose
 
 
 def read_file():
@@ -7,9 +11,8 @@ def read_file():
         return f.read(100)
 
 
-def calculate(power: int, p: int):
-    r = [i**power for i in range(10**p)]
-    return sum(r)
+def square(x: int):
+    return x * x
 
 
 async def main():
@@ -19,10 +22,17 @@ async def main():
         f = await loop.run_in_executor(pool, read_file)
         print(f)
 
-    with ProcessPoolExecutor() as pool:
-        f = await loop.run_in_executor(pool, calculate, 20, 5)
-        print(f)
+    # Спільний пул: процеси стартують один раз, а не в кожному main()
+    print("Workers:", await warm_up())
+    f = await run_in_pool(calculate, 20, 5)  # backend="generator": без списку в пам'яті
+    print(f)
+    print(calculate(20, 5, "faulhaber") == f)  # та сама сума за формулою, без циклу
+
+    # Багато дрібних задач — порціями, а не по одній
+    squares = await map_chunked(square, range(10_000), chunksize=1_000)
+    print(sum(squares))
+    await aclose()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    loop_bootstrap.run(main())
@@ -1,7 +1,11 @@
 import asyncio
-from concurrent.futures import ProcessPoolExecutor
 import random
 
+import loop_bootstrap
+import process_pool
+from loop_monitor import LoopLagMonitor
+from parallel import parallel_map_reduce, split_range
+
 
 async def ping(signal):
     print(f"Pinging {signal}")
@@ -24,17 +28,22 @@ def cpu_bound_operation(counter: int):
 async def main():
     loop = asyncio.get_running_loop()
     task = loop.create_task(ping_worker())
+    # Якщо CPU-робота випадково потрапить у loop, монітор одразу це покаже
+    monitor = LoopLagMonitor(interval=0.1, threshold=0.05)
+    monitor.start()
 
-    with ProcessPoolExecutor(2) as pool:
-        futures = [
-            loop.run_in_executor(pool, cpu_bound_operation, counter)
-            for counter in [100_000_000, 120_000_000, 150_000_000]
-        ]
-        result = await asyncio.gather(*futures)
-        task.cancel()
-        return result
+    # Кожен лічильник ріжеться на шматки (їх результати складаються через sum),
+    # щоб обидва процеси працювали до кінця, а не чекали на найдовшу задачу
+    result = await parallel_map_reduce(
+        cpu_bound_operation, [100_000_000, 120_000_000, 150_000_000], split=split_range, reduce=sum, workers=2, size=int
+    )
+    task.cancel()
+    monitor.stop()
+    print(monitor.report())
+    return result
 
 
 if __name__ == "__main__":
-    result = asyncio.run(main())
+    process_pool.configure(max_workers=2, max_tasks_per_child=100)
+    result = loop_bootstrap.run(main())
     print(result)
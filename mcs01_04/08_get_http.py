@@ -4,6 +4,9 @@ from concurrent.futures import ThreadPoolExecutor
 import requests
 from requests.exceptions import InvalidSchema, MissingSchema, SSLError, ConnectionError
 
+import loop_bootstrap
+from http_client import aiohttp_clients
+from preview import preview_all, PreviewError
 from timing import async_timed, sync_timed
 
 urls = [
@@ -47,10 +50,17 @@ async def main():
     return r
 
 
+@async_timed()
+async def main_native():
+    # Без потоків: один event loop, читаємо лише перші байти кожної сторінки
+    async with aiohttp_clients:
+        return await preview_all(urls, size=25, timeout=10)
+
+
 if __name__ == "__main__":
     print(main_sync())
 
-    r: list = asyncio.run(main())
+    r: list = loop_bootstrap.run(main())
     print(r)
     new_result = []
     for el in r:
@@ -58,3 +68,6 @@ if __name__ == "__main__":
             continue
         new_result.append(el)
     print(new_result)
+
+    r = loop_bootstrap.run(main_native())
+    print([el for el in r if not isinstance(el, PreviewError)])
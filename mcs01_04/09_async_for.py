@@ -4,6 +4,7 @@ from typing import AsyncIterator, Any
 from faker import Faker
 
 
+import loop_bootstrap
 from timing import async_timed
 
 fake = Faker("uk-UA")  # en-GB
@@ -29,6 +30,6 @@ async def main(users: AsyncIterator):
 
 
 if __name__ == "__main__":
-    r = asyncio.run(main(get_users([1, 2, 3])))
+    r = loop_bootstrap.run(main(get_users([1, 2, 3])))
     print(r)
     
\ No newline at end of file
@@ -1,6 +1,11 @@
+import argparse
 import asyncio
 from random import randint
 
+import loop_bootstrap
+from pipeline import Pipeline, check
+from work_queue import WorkerPool
+
 
 async def producer(q: asyncio.Queue):
     num = randint(1, 1000)
@@ -25,7 +30,59 @@ async def main():
     consumer_task.cancel()
 
 
+async def consume_batch(nums: list[int]):
+    await asyncio.sleep(0.01)  # імітація роботи, напр. один запис у БД на всю порцію
+    print(f"Consumer: {[num ** 2 for num in nums]}")
+
+
+async def main_pool(producers: int, consumers: int, maxsize: int, batch: int):
+    async with WorkerPool(consume_batch, workers=consumers, maxsize=maxsize, batch_size=batch, name="squares") as pool:
+        await asyncio.gather(*[producer(pool) for _ in range(producers)])
+    print(pool.metrics.report())
+
+
+async def produce(_) -> int:
+    await asyncio.sleep(0.1)
+    return randint(1, 1000)
+
+
+async def square(num: int) -> int:
+    return num ** 2
+
+
+async def show(num: int):
+    print(f"Consumer: {num}")
+
+
+async def main_pipeline(producers: int, consumers: int, maxsize: int):
+    # Та сама задача декларативно: черги, воркери й завершення — всередині Pipeline
+    pipeline = (
+        Pipeline(range(producers), buffer=maxsize)
+        .map(produce, concurrency=producers)
+        .map(square, concurrency=consumers, ordered=True)
+        .sink(show)
+    )
+    await pipeline.run()
+    for metrics in pipeline.metrics:
+        print(metrics.report())
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Producer/consumer queue")
+    parser.add_argument("--producers", type=int, default=100)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--maxsize", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--check", action="store_true", help="Stress-test the ordered pipeline stage and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        loop_bootstrap.run(check())
+        print("pipeline check ok")
+        raise SystemExit
+
+    loop_bootstrap.run(main())
+    loop_bootstrap.run(main_pool(args.producers, args.consumers, args.maxsize, args.batch))
+    loop_bootstrap.run(main_pipeline(args.producers, args.consumers, args.maxsize))
 
 
@@ -4,8 +4,14 @@ from concurrent.futures import ThreadPoolExecutor
 import requests
 from requests.exceptions import InvalidSchema, MissingSchema, SSLError, ConnectionError
 
+import loop_bootstrap
+from http_client import aiohttp_clients
+from preview import get_preview as get_preview_async
+from scatter import scatter_gather
 from timing import async_timed, sync_timed
 
+SLA = 2.0  # секунд на весь fan-out
+
 urls = [
     "https://github.com",
     "https://www.codewars.com",
@@ -48,25 +54,38 @@ async def main():
 async def main_err():
     loop = asyncio.get_running_loop()
 
-    with ThreadPoolExecutor(10) as pool:
-        futures = [loop.run_in_executor(pool, get_preview, url) for url in urls]
-        done, pending = await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
-        print('Done: ', done)
-        print('Pending: ', pending)
-        [task.cancel() for task in pending]
-        result = []
-        for task in done:
-            try:
-                result.append(await task)
-            except Exception as err:
-                print(err)
-        return result
+    # Не "with": його __exit__ чекав би на всі потоки, навіть "скасовані"
+    pool = ThreadPoolExecutor(10)
+    try:
+        futures = {url: loop.run_in_executor(pool, get_preview, url) for url in urls}
+        r = await scatter_gather(futures, deadline=SLA)
+    finally:
+        # Потік, що вже виконується, зупинити неможливо — лише не чекати на нього
+        pool.shutdown(wait=False, cancel_futures=True)
+    print('Stragglers: ', r.stragglers)
+    for url, err in r.errors.items():
+        print(url, err)
+    return [el for el in r.results.values() if el is not None]
+
+
+@async_timed()
+async def main_native():
+    # Корутини скасовуються по-справжньому: з'єднання закриваються одразу
+    async with aiohttp_clients:
+        r = await scatter_gather({url: get_preview_async(url) for url in urls}, deadline=SLA)
+    print('Stragglers: ', r.stragglers)
+    for url, err in r.errors.items():
+        print(url, err)
+    return list(r.results.values())
 
 
 if __name__ == "__main__":
-    r: list = asyncio.run(main())
+    r: list = loop_bootstrap.run(main())
+    print(r)
+
+    r: list = loop_bootstrap.run(main_err())
     print(r)
 
-    r: list = asyncio.run(main_err())
+    r: list = loop_bootstrap.run(main_native())
     print(r)
 
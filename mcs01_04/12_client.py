@@ -1,36 +1,59 @@
 import aiohttp
-import asyncio
-import platform
+
+import loop_bootstrap
+from cache import async_cached
+from http_client import aiohttp_clients
+from retry import RetryPolicy, LatencyTracker, call_with_retry
 
 
 class HttpError(Exception):
     pass
 
 
+class RetryableHttpError(HttpError):
+    """5xx, 429 або обрив з'єднання — є сенс повторити запит."""
+
+
+policy = RetryPolicy(attempts=4, attempt_timeout=5, deadline=15, retry_on=(RetryableHttpError, TimeoutError), hedge=True)
+latency = LatencyTracker()
+
+
+async def fetch(url: str):
+    session = aiohttp_clients.get()
+    try:
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                result = await resp.json()
+                return result
+            elif resp.status >= 500 or resp.status == 429:
+                raise RetryableHttpError(f"Error status: {resp.status} for {url}")
+            else:
+                raise HttpError(f"Error status: {resp.status} for {url}")
+    except aiohttp.InvalidURL as err:
+        raise HttpError(f'Invalid url: {url}', str(err))
+    except aiohttp.ClientConnectionError as err:
+        raise RetryableHttpError(f'Connection error: {url}', str(err))
+
+
+@async_cached(ttl=60)
 async def request(url: str):
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    return result
-                else:
-                    raise HttpError(f"Error status: {resp.status} for {url}")
-        except (aiohttp.ClientConnectorError, aiohttp.InvalidURL) as err:
-            raise HttpError(f'Connection error: {url}', str(err))
+    try:
+        return await call_with_retry(lambda: fetch(url), policy, latency)
+    except TimeoutError:
+        raise HttpError(f"Timeout: {url}")
 
 
 async def main():
-    try:
-        response = await request('https://api.privatbank.ua/p24api/pubinfo?exchange&coursid=5')
-        return response
-    except HttpError as err:
-        print(err)
-        return None
+    async with aiohttp_clients:
+        try:
+            response = await request('https://api.privatbank.ua/p24api/pubinfo?exchange&coursid=5')
+            return response
+        except HttpError as err:
+            print(err)
+            return None
 
 
 if __name__ == '__main__':
-    if platform.system() == 'Windows':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    r = asyncio.run(main())
+    r = loop_bootstrap.run(main())
     print(r)
+    print(request.cache_info())
@@ -1,40 +1,136 @@
-import sys
+import argparse
 from datetime import datetime, timedelta
+from pathlib import Path
+from time import monotonic
 
-import httpx
 import asyncio
-import platform
+
+import httpx
+
+import loop_bootstrap
+from cache import async_cached
+from http_client import httpx_clients
+from rates_cache import RatesCache
+from retry import RetryPolicy, LatencyTracker, call_with_retry
+
+
+URL = 'https://api.privatbank.ua/p24api/exchange_rates?date={}'
 
 
 class HttpError(Exception):
     pass
 
 
-async def request(url: str):
-    async with httpx.AsyncClient() as client:
+class RetryableHttpError(HttpError):
+    """5xx, 429 або обрив з'єднання — є сенс повторити запит."""
+
+
+policy = RetryPolicy(attempts=4, attempt_timeout=5, deadline=15, retry_on=(RetryableHttpError, TimeoutError), hedge=True)
+latency = LatencyTracker()
+
+
+async def fetch(url: str):
+    client = httpx_clients.get()
+    try:
         r = await client.get(url)
-        if r.status_code == 200:
-            result = r.json()
-            return result
-        else:
-            raise HttpError(f"Error status: {r.status_code} for {url}")
+    except httpx.TransportError as err:
+        raise RetryableHttpError(f'Connection error: {url}', str(err))
+    if r.status_code == 200:
+        result = r.json()
+        return result
+    elif r.status_code >= 500 or r.status_code == 429:
+        raise RetryableHttpError(f"Error status: {r.status_code} for {url}")
+    else:
+        raise HttpError(f"Error status: {r.status_code} for {url}")
 
 
-async def main(index_day):
+@async_cached(ttl=60 * 60)
+async def request(url: str):
+    try:
+        return await call_with_retry(lambda: fetch(url), policy, latency)
+    except TimeoutError:
+        raise HttpError(f"Timeout: {url}")
+
+
+class RateLimiter:
+    """Не більше rate запитів за секунду: старти запитів розносяться в часі."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.next_at = 0.0
+
+    async def __aenter__(self):
+        now = monotonic()
+        wait = self.next_at - now
+        self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def day_shift(index_day: int) -> str:
     # d = datetime.now() - timedelta(day=2) -> d.strftime("%d.%m.%Y")
     d = datetime.now() - timedelta(days=int(index_day))
-    shift = d.strftime("%d.%m.%Y")
-    try:
-        response = await request(f'https://api.privatbank.ua/p24api/exchange_rates?date={shift}')
-        return response
-    except HttpError as err:
-        print(err)
-        return None
+    return d.strftime("%d.%m.%Y")
+
+
+async def main(index_day):
+    shift = day_shift(index_day)
+    async with httpx_clients:
+        try:
+            response = await request(URL.format(shift))
+            return response
+        except HttpError as err:
+            print(err)
+            return None
+
+
+async def main_range(days: int, concurrency: int = 5, rate: float = 10, cache_path: str = "rates.db") -> dict:
+    """
+    Курси за останні days днів. Минулі дні беруться з кешу на диску,
+    з мережі вантажаться лише відсутні (паралельно, з обмеженням rate).
+    """
+    today = day_shift(0)
+    dates = [day_shift(i) for i in range(days)]
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+
+    with RatesCache(cache_path) as cache:
+        result = cache.get_many(dates)
+        missing = [date for date in dates if date not in result]
+        print(f"Cached: {len(result)}, to fetch: {len(missing)}")
+
+        async def fetch_day(date: str):
+            async with semaphore, limiter:
+                try:
+                    response = await request(URL.format(date))
+                except HttpError as err:
+                    print(err)
+                    return
+            result[date] = response
+            # сьогоднішній курс ще може змінитися, а порожня відповідь — не курс
+            if date != today and response.get("exchangeRate"):
+                cache.put(date, response)
+
+        async with httpx_clients:
+            await asyncio.gather(*[fetch_day(date) for date in missing])
+
+    return {date: result[date] for date in dates if date in result}
 
 
 if __name__ == '__main__':
-    if platform.system() == 'Windows':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    print(sys.argv)
-    r = asyncio.run(main(sys.argv[1]))
+    parser = argparse.ArgumentParser(description="PrivatBank exchange rates")
+    parser.add_argument("day", nargs="?", default=0, type=int, help="How many days ago")
+    parser.add_argument("--days", type=int, help="Fetch rates for the last N days")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--rate", type=float, default=10, help="Max requests per second")
+    parser.add_argument("--cache", default=str(Path(__file__).parent / "rates.db"))
+    args = parser.parse_args()
+
+    if args.days:
+        r = loop_bootstrap.run(main_range(args.days, args.concurrency, args.rate, args.cache))
+    else:
+        r = loop_bootstrap.run(main(args.day))
     print(r)
@@ -0,0 +1,71 @@
+import asyncio
+
+import aiohttp
+import httpx
+from aiohttp import web
+
+import loop_bootstrap
+from http_client import aiohttp_clients, httpx_clients
+from timing import async_timed
+
+REQUESTS = 500
+CONCURRENCY = 50
+
+
+async def start_stub_server() -> tuple[web.AppRunner, str]:
+    async def handler(request: web.Request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+async def run_all(fetch, url: str):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def bounded():
+        async with semaphore:
+            return await fetch(url)
+
+    return await asyncio.gather(*[bounded() for _ in range(REQUESTS)])
+
+
+async def aiohttp_per_call(url: str):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as resp:
+            return await resp.json()
+
+
+async def aiohttp_pooled(url: str):
+    async with aiohttp_clients.get().get(url) as resp:
+        return await resp.json()
+
+
+async def httpx_per_call(url: str):
+    async with httpx.AsyncClient() as client:
+        return (await client.get(url)).json()
+
+
+async def httpx_pooled(url: str):
+    return (await httpx_clients.get().get(url)).json()
+
+
+async def main():
+    runner, url = await start_stub_server()
+    try:
+        for fetch in [aiohttp_per_call, aiohttp_pooled, httpx_per_call, httpx_pooled]:
+            await async_timed(f"{fetch.__name__}: {REQUESTS} requests")(run_all)(fetch, url)
+    finally:
+        await aiohttp_clients.close()
+        await httpx_clients.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    loop_bootstrap.run(main())
@@ -0,0 +1,77 @@
+import asyncio
+import random
+from time import perf_counter
+
+from aiohttp import web
+
+import loop_bootstrap
+from http_client import aiohttp_clients
+from retry import RetryPolicy, LatencyTracker, call_with_retry
+
+REQUESTS = 300
+FAIL_RATE = 0.2  # частка відповідей 503
+SLOW_RATE = 0.05  # частка "застряглих" відповідей
+SLOW_DELAY = 1.0
+
+
+class ServerError(Exception):
+    pass
+
+
+async def start_flaky_server() -> tuple[web.AppRunner, str]:
+    async def handler(request: web.Request):
+        await asyncio.sleep(random.uniform(0.005, 0.02))
+        if random.random() < SLOW_RATE:
+            await asyncio.sleep(SLOW_DELAY)
+        if random.random() < FAIL_RATE:
+            return web.json_response({"error": "unavailable"}, status=503)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}/"
+
+
+async def fetch(url: str):
+    async with aiohttp_clients.get().get(url) as resp:
+        if resp.status >= 500:
+            raise ServerError(resp.status)
+        return await resp.json()
+
+
+async def measure(name: str, url: str, policy: RetryPolicy):
+    tracker = LatencyTracker()
+    timings = []
+    errors = 0
+    for _ in range(REQUESTS):
+        start = perf_counter()
+        try:
+            await call_with_retry(lambda: fetch(url), policy, tracker)
+        except (ServerError, TimeoutError):
+            errors += 1
+        timings.append(perf_counter() - start)
+    timings.sort()
+    p50, p95, p99 = (timings[int(q * (len(timings) - 1))] for q in (0.5, 0.95, 0.99))
+    print(f"{name:<12} errors={errors:<4} p50={p50:.3f} p95={p95:.3f} p99={p99:.3f}")
+
+
+async def main():
+    runner, url = await start_flaky_server()
+    retry_on = (ServerError, TimeoutError)
+    try:
+        await measure("no retry", url, RetryPolicy(attempts=1, retry_on=retry_on))
+        await measure("retry", url, RetryPolicy(attempts=4, base_delay=0.01, retry_on=retry_on))
+        await measure(
+            "retry+hedge", url, RetryPolicy(attempts=4, base_delay=0.01, retry_on=retry_on, hedge=True)
+        )
+    finally:
+        await aiohttp_clients.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    loop_bootstrap.run(main())
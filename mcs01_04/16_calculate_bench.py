@@ -0,0 +1,39 @@
+import argparse
+from time import perf_counter
+
+from power_sums import BACKENDS, calculate, check, np
+
+BUDGET = 10.0  # якщо бекенд рахував довше, більші p для нього пропускаємо
+LIST_MAX_P = 7  # список з 10**8 великих чисел не влізе в пам'ять
+
+
+def bench(power: int, max_p: int):
+    backends = [name for name in BACKENDS if name != "numpy" or np is not None]
+    slow = set()
+    print(f"power={power}")
+    print(f"{'p':>2} " + " ".join(f"{name:>12}" for name in backends))
+    for p in range(1, max_p + 1):
+        row, results = [], set()
+        for name in backends:
+            if name in slow or (name == "list" and p > LIST_MAX_P):
+                row.append(f"{'-':>12}")
+                continue
+            start = perf_counter()
+            results.add(calculate(power, p, name))
+            elapsed = perf_counter() - start
+            row.append(f"{elapsed:>12.4f}")
+            if elapsed > BUDGET:
+                slow.add(name)
+        assert len(results) == 1, f"backends disagree for p={p}"
+        print(f"{p:>2} " + " ".join(row))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark calculate() backends")
+    parser.add_argument("--power", type=int, default=20)
+    parser.add_argument("--max-p", type=int, default=8)
+    args = parser.parse_args()
+
+    check()
+    print("All backends agree with the list version")
+    bench(args.power, args.max_p)
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import loop_bootstrap
+from parallel import parallel_map_reduce, split_range
+
+WORKLOAD = [100_000_000, 120_000_000, 150_000_000]
+
+
+def count_down(counter: int):
+    init = counter
+    while counter > 0:
+        counter -= 1
+    return init
+
+
+async def one_future_per_task(pool: ProcessPoolExecutor, tasks: list[int]):
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*[loop.run_in_executor(pool, count_down, counter) for counter in tasks])
+
+
+async def chunked(pool: ProcessPoolExecutor, tasks: list[int], workers: int):
+    return await parallel_map_reduce(
+        count_down, tasks, split=split_range, reduce=sum, executor=pool, workers=workers, size=int
+    )
+
+
+async def main(scale: float, max_workers: int):
+    tasks = [int(counter * scale) for counter in WORKLOAD]
+    print(f"Workload: {tasks}")
+    print(f"{'workers':>7} {'per task':>10} {'chunked':>10}")
+    for workers in range(1, max_workers + 1):
+        with ProcessPoolExecutor(workers) as pool:
+            await one_future_per_task(pool, [1] * workers)  # прогрів процесів
+
+            start = perf_counter()
+            plain = await one_future_per_task(pool, tasks)
+            plain_time = perf_counter() - start
+
+            start = perf_counter()
+            split = await chunked(pool, tasks, workers)
+            chunked_time = perf_counter() - start
+
+        assert plain == split == tasks
+        print(f"{workers:>7} {plain_time:>10.2f} {chunked_time:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel countdown: one future per task vs chunked")
+    parser.add_argument("--scale", type=float, default=1.0, help="Workload multiplier, e.g. 0.1 for a quick run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Benchmark 1..N workers")
+    args = parser.parse_args()
+    loop_bootstrap.run(main(args.scale, args.workers))
@@ -0,0 +1,70 @@
+import asyncio
+from time import perf_counter
+
+import loop_bootstrap
+
+TASKS = 100_000
+QUEUE_ITEMS = 200_000
+ECHO_ROUNDS = 20_000
+
+
+async def noop():
+    pass
+
+
+async def bench_tasks():
+    await asyncio.gather(*[asyncio.create_task(noop()) for _ in range(TASKS)])
+
+
+async def bench_queue():
+    queue = asyncio.Queue(maxsize=1000)
+
+    async def producer():
+        for i in range(QUEUE_ITEMS):
+            await queue.put(i)
+        await queue.put(None)
+
+    async def consumer():
+        while await queue.get() is not None:
+            pass
+
+    await asyncio.gather(producer(), consumer())
+
+
+async def bench_echo():
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while data := await reader.readline():
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(ECHO_ROUNDS):
+        writer.write(b"ping\n")
+        await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+    server.close()
+    await server.wait_closed()
+
+
+def measure(factory, bench) -> float:
+    with asyncio.Runner(loop_factory=factory) as runner:
+        start = perf_counter()
+        runner.run(bench())
+        return perf_counter() - start
+
+
+if __name__ == "__main__":
+    factories = {"asyncio": asyncio.new_event_loop}
+    if loop_bootstrap.uvloop is not None:
+        factories["uvloop"] = loop_bootstrap.uvloop.new_event_loop
+    else:
+        print("uvloop is not installed: pip install uvloop")
+
+    print(f"{'benchmark':<12}" + "".join(f"{name:>10}" for name in factories))
+    for bench in [bench_tasks, bench_queue, bench_echo]:
+        row = "".join(f"{measure(factory, bench):>10.3f}" for factory in factories.values())
+        print(f"{bench.__name__:<12}{row}")
@@ -0,0 +1,88 @@
+import asyncio
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from time import monotonic
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "inflight"])
+
+
+def _make_key(args: tuple, kwargs: dict):
+    if not kwargs:
+        return args
+    return args, tuple(sorted(kwargs.items()))
+
+
+def async_cached(ttl: float = None, maxsize: int = 128):
+    """
+    Кешування результатів корутини (TTL + LRU).
+
+    Одночасні виклики з однаковими аргументами чекають на один і той самий
+    запит (single-flight), а не роблять його кожен окремо.
+    Винятки не кешуються.
+    """
+
+    def wrapper(func):
+        cache: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        inflight: dict = {}  # key -> asyncio.Task
+        stats = {"hits": 0, "misses": 0}
+
+        def _get(key):
+            item = cache.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= monotonic():
+                del cache[key]
+                return False, None
+            cache.move_to_end(key)
+            return True, value
+
+        def _put(key, value):
+            cache[key] = (monotonic() + ttl if ttl is not None else None, value)
+            cache.move_to_end(key)
+            if maxsize is not None:
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+        async def _load(key, args, kwargs):
+            try:
+                result = await func(*args, **kwargs)
+                _put(key, result)
+                return result
+            finally:
+                inflight.pop(key, None)
+
+        @wraps(func)
+        async def wrapped(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            found, value = _get(key)
+            if found:
+                stats["hits"] += 1
+                return value
+
+            task = inflight.get(key)
+            if task is None or task.get_loop() is not asyncio.get_running_loop():
+                stats["misses"] += 1
+                task = asyncio.create_task(_load(key, args, kwargs))
+                inflight[key] = task
+            else:
+                stats["hits"] += 1
+            # shield: скасування одного з очікувачів не скасовує спільний запит
+            return await asyncio.shield(task)
+
+        def cache_info() -> CacheInfo:
+            return CacheInfo(stats["hits"], stats["misses"], maxsize, len(cache), len(inflight))
+
+        def cache_invalidate(*args, **kwargs) -> bool:
+            return cache.pop(_make_key(args, kwargs), None) is not None
+
+        def cache_clear() -> None:
+            cache.clear()
+            stats["hits"] = stats["misses"] = 0
+
+        wrapped.cache_info = cache_info
+        wrapped.cache_invalidate = cache_invalidate
+        wrapped.cache_clear = cache_clear
+        return wrapped
+
+    return wrapper
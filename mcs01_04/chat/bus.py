@@ -0,0 +1,101 @@
+"""
+Локальна шина між процесами чату: брокер на Unix-сокеті.
+
+Кожен воркер підключається до брокера і публікує події (рядок JSON).
+Брокер пересилає подію всім іншим воркерам, а ті доставляють її своїм
+клієнтам. Так повідомлення з воркера A доходить до клієнтів воркера B.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+BUS_PATH = "/tmp/chat-bus.sock"
+LIMIT = 2**20  # найдовша подія, байт
+
+
+async def serve_broker(path: str = BUS_PATH):
+    peers: set[asyncio.StreamWriter] = set()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peers.add(writer)
+        try:
+            while line := await reader.readline():
+                others = [peer for peer in peers if peer is not writer]
+                for peer in others:
+                    peer.write(line)
+                # воркер, що не встигає читати, гальмує лише відправника цієї події
+                await asyncio.gather(*(peer.drain() for peer in others), return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as err:
+            logging.warning(f"bus peer dropped: {err!r}")
+        finally:
+            peers.discard(writer)
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)  # сокет від попереднього запуску
+    server = await asyncio.start_unix_server(handle, path, limit=LIMIT)
+    logging.info(f"bus listening on {path}")
+    async with server:
+        await server.serve_forever()
+
+
+def run_broker(path: str = BUS_PATH):
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve_broker(path))
+    except KeyboardInterrupt:
+        pass
+
+
+class Bus:
+    def __init__(self, path: str = BUS_PATH):
+        self.path = path
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.alive = False  # False — брокера немає, повідомлення лишаються в цьому воркері
+
+    async def connect(self, attempts: int = 50, delay: float = 0.1):
+        # брокер стартує паралельно з воркерами — чекаємо, поки з'явиться сокет
+        for attempt in range(attempts):
+            try:
+                self.reader, self.writer = await asyncio.open_unix_connection(self.path, limit=LIMIT)
+                self.alive = True
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(delay)
+
+    def _lost(self, reason: str):
+        if self.alive:
+            self.alive = False
+            logging.error(f"bus connection lost ({reason}), messages stay local to this worker")
+
+    async def publish(self, event: dict):
+        if not self.alive:
+            return
+        try:
+            self.writer.write(json.dumps(event, ensure_ascii=False).encode() + b"\n")
+            await self.writer.drain()
+        except ConnectionError as err:
+            self._lost(repr(err))
+
+    async def listen(self, handler):
+        """Викликає handler(event) для кожної події від інших воркерів."""
+        try:
+            while line := await self.reader.readline():
+                await handler(json.loads(line))
+        except ConnectionError as err:
+            self._lost(repr(err))
+        else:
+            self._lost("broker closed the socket")
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
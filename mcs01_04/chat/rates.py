@@ -0,0 +1,83 @@
+"""
+Курс валют для команди "exchange": кеш з TTL, один запит до Привату на всіх.
+
+Поки дані свіжі (ttl) — віддаємо з кешу. Після ttl, але в межах stale,
+віддаємо старі дані одразу й оновлюємо у фоні. Якщо даних немає або вони
+зовсім застарілі — чекаємо оновлення (а якщо Приват не відповідає —
+віддаємо останні відомі). Одночасні запити чекають одну й ту
+саму задачу, а не роблять кожен свій.
+"""
+
+import asyncio
+import logging
+import os
+from time import monotonic
+
+import httpx
+
+RATES_URL = os.environ.get("RATES_URL", "https://api.privatbank.ua/p24api/pubinfo?exchange&coursid=5")
+ERROR_MESSAGE = "Не вийшло в мене взнати курс. Приват не відповідає :)"
+
+
+class RatesError(Exception):
+    pass
+
+
+def format_rates(rates: list[dict]) -> str:
+    lines = ["Валюта   Купівля   Продаж"]
+    for rate in rates:
+        pair = f"{rate['ccy']}/{rate['base_ccy']}"
+        lines.append(f"{pair:<8} {float(rate['buy']):>8.2f} {float(rate['sale']):>8.2f}")
+    return "\n".join(lines)
+
+
+class RatesProvider:
+    def __init__(self, client: httpx.AsyncClient, url: str = RATES_URL, ttl: float = 60, stale: float = 600):
+        self.client = client
+        self.url = url
+        self.ttl = ttl
+        self.stale = stale
+        self.value: str | None = None
+        self.updated = 0.0
+        self.refreshing: asyncio.Task | None = None
+
+    async def fetch(self) -> str:
+        r = await self.client.get(self.url)
+        if r.status_code != 200:
+            raise RatesError(f"{self.url} answered {r.status_code}")
+        try:
+            return format_rates(r.json())
+        except (ValueError, KeyError, TypeError) as err:
+            raise RatesError(f"unexpected answer from {self.url}: {err!r}") from err
+
+    async def _refresh(self) -> str:
+        try:
+            self.value = await self.fetch()
+            self.updated = monotonic()
+            return self.value
+        finally:
+            self.refreshing = None
+
+    def refresh(self) -> asyncio.Task:
+        if self.refreshing is None:
+            self.refreshing = asyncio.create_task(self._refresh())
+            self.refreshing.add_done_callback(self._log_failure)
+        return self.refreshing
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(f"rates refresh failed: {task.exception()!r}")
+
+    async def get(self) -> str:
+        age = monotonic() - self.updated
+        if self.value is not None and age < self.ttl:
+            return self.value
+        if self.value is not None and age < self.stale:
+            self.refresh()  # stale-while-revalidate
+            return self.value
+        try:
+            # shield: клієнт, що відключився, не скасовує запит для решти
+            return await asyncio.shield(self.refresh())
+        except (httpx.HTTPError, RatesError):
+            return self.value or ERROR_MESSAGE
@@ -1,72 +1,283 @@
+import argparse
 import asyncio
 import logging
+import signal
+import socket
+import sys
+from collections import defaultdict
+from multiprocessing import Process
 
 import httpx
 import websockets
 import names
+from bus import BUS_PATH, Bus, run_broker
+from rates import RatesProvider
 from websockets import ServerProtocol
-from websockets.exceptions import ConnectionClosedOK
+from websockets.exceptions import ConnectionClosed
 
 logging.basicConfig(level=logging.INFO)
 
+OUTBOX_SIZE = 256  # скільки повідомлень може чекати на одного клієнта
+SLOW_POLICY = "drop"  # drop — губити нові повідомлення повільному клієнту, kick — відключати його
+DEFAULT_ROOM = "general"
 
-async def request(url: str) -> dict | str:
-    async with httpx.AsyncClient() as client:
-        r = await client.get(url)
-        if r.status_code == 200:
-            result = r.json()
-            return result
-        else:
-            return "Не вийшло в мене взнати курс. Приват не відповідає :)"
+
+# Один клієнт (пул з'єднань) і один кеш курсу на весь сервер, створюються в main()
+http_client: httpx.AsyncClient | None = None
+rates: RatesProvider | None = None
 
 
 async def get_exchange():
-    response = await request(f'https://api.privatbank.ua/p24api/pubinfo?exchange&coursid=5')
-    # переробить на більш придатний результат
-    return str(response)
+    return await rates.get()
+
+
+class Outbox:
+    """
+    Черга вихідних повідомлень одного клієнта і задача, що їх відправляє.
+    Розсилка лише кладе повідомлення в черги, тож повільний або мертвий
+    клієнт не затримує інших.
+    """
+
+    def __init__(self, ws: ServerProtocol, maxsize: int = OUTBOX_SIZE, policy: str = SLOW_POLICY):
+        self.ws = ws
+        self.policy = policy
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.task = asyncio.create_task(self.writer())
+
+    def put(self, data: bytes):
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.policy == "kick":
+                self.kick()
+
+    def kick(self):
+        if not self.task.done():
+            logging.warning(f'{self.ws.remote_address} is too slow, disconnecting')
+            self.task.cancel()
+            asyncio.create_task(self.disconnect())
+
+    async def disconnect(self):
+        # close() спершу чекає, поки звільниться буфер запису, а клієнт його не читає
+        try:
+            async with asyncio.timeout(self.ws.close_timeout or 10):
+                await self.ws.close(1008, "too slow")
+        except TimeoutError:
+            self.ws.transport.abort()
+
+    async def writer(self):
+        try:
+            while True:
+                # text=True: готові UTF-8 байти йдуть текстовим фреймом без повторного кодування
+                await self.ws.send(await self.queue.get(), text=True)
+        except ConnectionClosed:
+            pass
+
+    async def close(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        if self.dropped:
+            logging.info(f'{self.ws.remote_address} missed {self.dropped} messages')
 
 
 class Server:
+    """
+    Кімнати: rooms — назва -> учасники, room_of — клієнт -> його кімната,
+    by_name — ім'я -> з'єднання для особистих повідомлень. Розсилка йде лише
+    учасникам кімнати, тож її ціна залежить від розміру кімнати, а не сервера.
+
+    /join <кімната>, /leave, /rooms, /msg <ім'я>: <текст>
+
+    З bus (кілька процесів) розсилка в кімнату й особисті повідомлення для
+    клієнтів інших воркерів ідуть ще й через шину; /rooms показує лише своїх.
+    Чи є адресат /msg на іншому воркері, невідомо — відправник бачить лише,
+    що повідомлення пішло в шину. Без брокера все працює в межах воркера.
+    """
+
     clients = set()
+    outboxes = {}
+    rooms = defaultdict(set)
+    room_of = {}
+    by_name = {}
+    bus: Bus | None = None
 
     async def register(self, ws: ServerProtocol):
         ws.name = names.get_full_name()
+        while ws.name in self.by_name:
+            ws.name = names.get_full_name()
+        self.outboxes[ws] = Outbox(ws, OUTBOX_SIZE, SLOW_POLICY)
         self.clients.add(ws)
+        self.by_name[ws.name] = ws
+        await self.join(ws, DEFAULT_ROOM)
         logging.info(f'{ws.remote_address} connects')
 
     async def unregister(self, ws: ServerProtocol):
+        await self.leave(ws)
+        del self.by_name[ws.name]
         self.clients.remove(ws)
+        await self.outboxes.pop(ws).close()
         logging.info(f'{ws.remote_address} disconnects')
 
-    async def send_to_clients(self, message: str):
-        if self.clients:
-            [await client.send(message) for client in self.clients]
+    async def join(self, ws: ServerProtocol, room: str):
+        if self.room_of.get(ws) == room:
+            return
+        await self.leave(ws)
+        self.rooms[room].add(ws)
+        self.room_of[ws] = room
+        await self.send_to_room(room, f"{ws.name} joined #{room} ({len(self.rooms[room])} here)")
+
+    async def leave(self, ws: ServerProtocol):
+        room = self.room_of.pop(ws, None)
+        if room is None:
+            return
+        members = self.rooms[room]
+        members.discard(ws)
+        if members:
+            await self.send_to_room(room, f"{ws.name} left #{room}")
+        else:
+            del self.rooms[room]  # порожні кімнати не накопичуються
+
+    async def send_to_room(self, room: str, message: str):
+        self.deliver_to_room(room, message)
+        if self.bus is not None:
+            await self.bus.publish({"room": room, "text": message})
+
+    def deliver_to_room(self, room: str, message: str):
+        # кодуємо один раз на розсилку, а не на кожного клієнта
+        data = message.encode()
+        for client in self.rooms.get(room, ()):
+            self.outboxes[client].put(data)
+
+    async def on_bus_event(self, event: dict):
+        # подія від іншого воркера — лише доставити своїм клієнтам, не публікувати знову
+        if "room" in event:
+            self.deliver_to_room(event["room"], event["text"])
+        elif event.get("to") in self.by_name:
+            await self.send_to(self.by_name[event["to"]], event["text"])
+
+    async def send_to(self, ws: ServerProtocol, message: str):
+        self.outboxes[ws].put(message.encode())
 
     async def ws_handler(self, ws: ServerProtocol):
         await self.register(ws)
         try:
             await self.distrubute(ws)
-        except ConnectionClosedOK:
+        except ConnectionClosed:
             pass
         finally:
             await self.unregister(ws)
 
+    async def command(self, ws: ServerProtocol, message: str):
+        command, _, arg = message.partition(" ")
+        arg = arg.strip()
+        if command == "/join" and arg:
+            await self.join(ws, arg.lstrip("#"))
+        elif command == "/leave":
+            # без кімнати клієнт нічого б не чув — повертаємо в загальну
+            await self.join(ws, DEFAULT_ROOM)
+        elif command == "/rooms":
+            await self.send_to(ws, ", ".join(f"#{room} ({len(members)})" for room, members in sorted(self.rooms.items())))
+        elif command == "/msg" and ":" in arg:
+            name, _, text = arg.partition(":")
+            name, text = name.strip(), text.strip()
+            target = self.by_name.get(name)
+            if target is None and self.bus is not None and self.bus.alive:
+                # можливо, адресат на іншому воркері; підтвердження від них немає
+                await self.bus.publish({"to": name, "text": f"{ws.name} (private): {text}"})
+                await self.send_to(ws, f"{ws.name} -> {name}: {text} (delivered only if {name} is online)")
+            elif target is None:
+                await self.send_to(ws, f"{name} is not here")
+            else:
+                await self.send_to(target, f"{ws.name} (private): {text}")
+                if target is not ws:
+                    await self.send_to(ws, f"{ws.name} -> {target.name}: {text}")
+        else:
+            await self.send_to(ws, "commands: /join <room>, /leave, /rooms, /msg <name>: <text>")
+
     async def distrubute(self, ws: ServerProtocol):
         async for message in ws:
-            if message == "exchange":
+            room = self.room_of[ws]
+            if message.startswith("/"):
+                await self.command(ws, message)
+            elif message == "exchange":
                 exchange = await get_exchange()
-                await self.send_to_clients(exchange)
+                await self.send_to_room(room, exchange)
             elif message == 'Hello server':
-                await self.send_to_clients("Привіт мої карапузи!")
+                await self.send_to_room(room, "Привіт мої карапузи!")
             else:
-                await self.send_to_clients(f"{ws.name}: {message}")
+                await self.send_to_room(room, f"{ws.name}: {message}")
 
 
-async def main():
+async def serve(host: str, port: int, bus_path: str | None = None):
+    global http_client, rates
     server = Server()
-    async with websockets.serve(server.ws_handler, 'localhost', 8080):
-        await asyncio.Future()  # run forever
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+    async with httpx.AsyncClient(limits=limits, timeout=10) as http_client:
+        rates = RatesProvider(http_client)
+        listener = None
+        if bus_path is not None:
+            server.bus = Bus(bus_path)
+            await server.bus.connect()
+            listener = asyncio.create_task(server.bus.listen(server.on_bus_event))
+        try:
+            # reuse_port: усі воркери слухають той самий порт, ядро розподіляє з'єднання
+            async with websockets.serve(server.ws_handler, host, port, reuse_port=bus_path is not None):
+                await asyncio.Future()  # run forever
+        finally:
+            if listener is not None:
+                listener.cancel()
+                await server.bus.close()
+
+
+def run_worker(host: str, port: int, bus_path: str | None = None):
+    try:
+        asyncio.run(serve(host, port, bus_path))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Websocket chat")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Server processes sharing the port")
+    parser.add_argument("--bus", default=BUS_PATH, help="Unix socket of the broker between workers")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        run_worker(args.host, args.port)
+        return
+    if not hasattr(socket, "SO_REUSEPORT"):
+        parser.error("--workers needs SO_REUSEPORT (Linux, BSD, macOS)")
+
+    broker = Process(target=run_broker, args=(args.bus,), name="chat-bus")
+    workers = [
+        Process(target=run_worker, args=(args.host, args.port, args.bus), name=f"chat-worker-{i}")
+        for i in range(args.workers)
+    ]
+    broker.start()
+    for worker in workers:
+        worker.start()
+    # після старту дочірніх процесів, щоб вони лишились зі стандартною обробкою
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        # Ctrl+C отримують усі процеси групи, лишається дочекатися
+        for worker in workers:
+            worker.join()
+    finally:
+        for process in [*workers, broker]:
+            if process.is_alive():
+                process.terminate()
+            process.join()
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    main()
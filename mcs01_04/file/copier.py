@@ -0,0 +1,168 @@
+"""
+Копіювання без проганяння байтів через Python.
+
+copy     — reflink (CoW-клон на btrfs/xfs), інакше os.copy_file_range, інакше
+           os.sendfile, інакше звичайний shutil.copyfile
+hardlink — os.link, якщо source і output на одній ФС (інакше — copy)
+move     — os.link + unlink на тій самій ФС (інакше — копія і видалення source);
+           ніколи не перезаписує файл в output
+"""
+
+import asyncio
+import errno
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+CHUNK = 64 * 1024 * 1024
+
+# Помилки, що означають "ФС/ядро цього не вміє", а не "файл зламаний"
+UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS, errno.EBADF, errno.EPERM}
+
+# (метод, st_dev source, st_dev output) -> False, якщо вже не вдалося
+_supported: dict[tuple, bool] = {}
+
+
+def _try(method: str, devices: tuple, func, *args) -> bool:
+    key = (method, *devices)
+    if _supported.get(key) is False:
+        return False
+    try:
+        func(*args)
+    except OSError as err:
+        if err.errno not in UNSUPPORTED:
+            raise
+        _supported[key] = False
+        return False
+    return True
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int) -> None:
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, "reflink is not available")
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(src_fd, dst_fd, min(CHUNK, size - copied))
+        if sent == 0:
+            break
+        copied += sent
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> None:
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile is not available")
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, min(CHUNK, size - offset))
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _reset(dst_fd: int) -> None:
+    # невдала спроба могла встигнути щось записати
+    os.ftruncate(dst_fd, 0)
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+
+
+def _copyfileobj(fsrc, fdst, size: int) -> None:
+    while size > 0 and (chunk := fsrc.read(min(CHUNK, size))):
+        fdst.write(chunk)
+        size -= len(chunk)
+
+
+def copy(src: str, dst: str, limit: int | None = None) -> str:
+    """limit — скопіювати лише перші limit байт (для пробних замірів)."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        full = os.fstat(src_fd).st_size
+        size = full if limit is None else min(full, limit)
+        devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+        methods = [("copy_file_range", _copy_file_range), ("sendfile", _sendfile)]
+        if size == full:
+            methods.insert(0, ("reflink", _reflink))  # клонує лише файл цілком
+        for method, func in methods:
+            if _try(method, devices, func, src_fd, dst_fd, size):
+                return method
+            _reset(dst_fd)
+        _copyfileobj(fsrc, fdst, size)
+        return "copyfileobj"
+
+
+def hardlink(src: str, dst: str) -> str:
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError as err:
+        if err.errno not in UNSUPPORTED:
+            raise
+        return copy(src, dst)
+
+
+def _reserve(dst: str) -> None:
+    # O_EXCL: атомарно займає ім'я або FileExistsError, якщо воно вже зайняте
+    os.close(os.open(dst, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+
+
+def move(src: str, dst: str) -> str:
+    """
+    Після move source більше немає, тож перезапис dst втратив би дані назавжди.
+    Якщо dst зайнятий — FileExistsError, а source лишається на місці.
+    """
+    try:
+        os.link(src, dst)  # на відміну від rename, не перезаписує dst
+    except OSError as err:
+        if err.errno not in UNSUPPORTED:
+            raise
+    else:
+        os.unlink(src)
+        return "rename"
+    # інша ФС або ФС без hardlink-ів: спершу займаємо ім'я, потім замінюємо свій порожній файл
+    _reserve(dst)
+    try:
+        os.replace(src, dst)
+        return "rename"
+    except OSError as err:
+        if err.errno != errno.EXDEV:
+            os.unlink(dst)
+            raise
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst) or ".", suffix=".part")
+    os.close(fd)
+    try:
+        copy(src, tmp)
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        os.unlink(dst)
+        raise
+    os.unlink(src)
+    return "move"
+
+
+MODES = {"copy": copy, "hardlink": hardlink, "move": move}
+
+
+def transfer_sync(src: str, dst: str, mode: str = "copy") -> tuple[str, int]:
+    """Повертає (яким способом, скільки байт)."""
+    size = os.stat(src).st_size
+    return MODES[mode](src, dst), size
+
+
+async def transfer(src, dst, mode: str = "copy") -> tuple[str, int]:
+    return await asyncio.to_thread(transfer_sync, str(src), str(dst), mode)
@@ -0,0 +1,133 @@
+"""
+Дедуплікація за вмістом і журнал для відновлення перерваного сортування.
+
+Журнал (.sort-journal.jsonl в output) — по рядку на кожен оброблений файл.
+При повторному запуску файли з журналу (той самий шлях, розмір і mtime)
+пропускаються, а їх хеші знову відомі без читання.
+
+Імена призначаються, коли хеші всіх файлів уже відомі, тож результат не
+залежить від порядку обходу і кількості воркерів: з однакових файлів
+копіюється той, чий шлях у source менший, а з різних файлів з однаковим
+іменем голе ім'я дістається меншому хешу, решта — з суфіксом хешу.
+Імена, зайняті в output попередніми запусками, лишаються за своїм вмістом.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+CHUNK = 1024 * 1024
+JOURNAL = ".sort-journal.jsonl"
+
+
+def hash_file(path: Path) -> str:
+    # blake2b швидший за sha256 і відпускає GIL на великих шматках
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+Entry = tuple[Path, os.stat_result, str]  # файл, його stat і хеш
+
+
+def _key(src: Path, stat: os.stat_result) -> tuple:
+    return str(src), stat.st_size, stat.st_mtime_ns
+
+
+class Deduplicator:
+    def __init__(self, output: Path):
+        self.output = Path(output)
+        self.journal_path = self.output / JOURNAL
+        self.processed: set[tuple] = set()
+        self.by_hash: dict[str, Path] = {}  # вміст -> куди вже скопійовано
+        self.by_dest: dict[Path, str] = {}  # ім'я в output -> чий це вміст
+        self.journal = None
+
+    def open(self) -> None:
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # недописаний рядок після аварійної зупинки
+                    self.processed.add((record["src"], record["size"], record["mtime_ns"]))
+                    dest = Path(record["dest"])
+                    self.by_hash.setdefault(record["hash"], dest)
+                    self.by_dest.setdefault(dest, record["hash"])
+        self.output.mkdir(parents=True, exist_ok=True)
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+    def is_done(self, src: Path, stat: os.stat_result) -> bool:
+        return _key(src, stat) in self.processed
+
+    async def _owner(self, dest: Path) -> str | None:
+        if dest not in self.by_dest and await asyncio.to_thread(dest.exists):
+            # файл у output з попереднього запуску без журналу
+            digest = await asyncio.to_thread(hash_file, dest)
+            self.by_dest.setdefault(dest, digest)
+            self.by_hash.setdefault(digest, dest)
+        return self.by_dest.get(dest)
+
+    @staticmethod
+    def _suffixed(dest: Path, digest: str) -> Path:
+        return dest.with_name(f"{dest.stem}-{digest[:8]}{dest.suffix}")
+
+    async def assign(self, entries: list[Entry], folder_of) -> tuple[list[tuple[Entry, Path]], list[Entry]]:
+        """
+        Повертає (що і куди копіювати, дублікати). folder_of(path) — тека в output.
+        """
+        for dest in sorted({folder_of(path) / path.name for path, _, _ in entries}):
+            await self._owner(dest)  # файли в output з попередніх запусків
+        groups: dict[str, list[Entry]] = defaultdict(list)
+        for entry in entries:
+            groups[entry[2]].append(entry)
+        by_name: dict[Path, list[Entry]] = defaultdict(list)
+        duplicates = []
+        for digest, group in groups.items():
+            group.sort(key=lambda entry: str(entry[0]))
+            if digest in self.by_hash:
+                duplicates += group
+                continue
+            path = group[0][0]
+            by_name[folder_of(path) / path.name].append(group[0])
+            duplicates += group[1:]
+        copies = []
+        for dest, group in by_name.items():
+            group.sort(key=lambda entry: entry[2])
+            for i, entry in enumerate(group):
+                free = i == 0 and dest not in self.by_dest
+                copies.append((entry, dest if free else self._suffixed(dest, entry[2])))
+        return copies, duplicates
+
+    def commit(self, src: Path, stat: os.stat_result, digest: str, dest: Path) -> None:
+        self.by_hash[digest] = dest
+        self.by_dest[dest] = digest
+        self.record(src, stat, digest, dest, "copied")
+
+    def duplicate(self, src: Path, stat: os.stat_result, digest: str) -> bool:
+        """
+        Дублікат потрапляє в журнал лише після того, як копія-власник дописана.
+        Якщо вона не вдалася — False: файл не записаний як оброблений і буде
+        спробуваний знову при наступному запуску.
+        """
+        if digest not in self.by_hash:
+            return False
+        self.record(src, stat, digest, self.by_hash[digest], "duplicate")
+        return True
+
+    def record(self, src: Path, stat: os.stat_result, digest: str, dest: Path, status: str) -> None:
+        src_, size, mtime_ns = _key(src, stat)
+        record = {"src": src_, "size": size, "mtime_ns": mtime_ns, "hash": digest, "dest": str(dest), "status": status}
+        self.journal.write(json.dumps(record) + "\n")
+        self.journal.flush()
+        self.processed.add((src_, size, mtime_ns))
@@ -5,47 +5,209 @@
 import argparse
 import asyncio
 import logging
+import os
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from time import perf_counter
 
 from aiopath import AsyncPath
-from aioshutil import copyfile
+
+from copier import transfer
+from dedup import Deduplicator, Entry, hash_file
+from planner import build_plan, describe, estimate, load_plan, save_plan
+from scanner import scan
 
 """
---source [-s] 
+--source [-s]
 --output [-o] default folder = dist
+--workers [-w] кількість одночасних копіювань
+--move / --hardlink замість копіювання (на тій самій ФС — без копіювання байтів)
+--dedup пропускати однакові за вмістом файли, продовжувати перерваний запуск
+--plan FILE лише скласти план (теки, обсяги, оцінка часу) і записати в FILE
+--execute FILE виконати збережений план без повторного сканування source
 """
 
 parser = argparse.ArgumentParser(description="Sorting folder")
-parser.add_argument("--source", "-S", help="Source folder", required=True)
+parser.add_argument("--source", "-S", help="Source folder")
 parser.add_argument("--output", "-O", help="Output folder", default="dist")
+parser.add_argument("--workers", "-W", help="Concurrent copy workers", type=int, default=16)
+parser.add_argument("--queue-size", help="Max files waiting for a worker", type=int, default=1000)
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument("--move", dest="mode", action="store_const", const="move", help="Move files instead of copying")
+mode.add_argument("--hardlink", dest="mode", action="store_const", const="hardlink", help="Hardlink instead of copying")
+parser.set_defaults(mode="copy")
+parser.add_argument("--dedup", action="store_true", help="Skip duplicates by content hash and resume from the journal")
+plan = parser.add_mutually_exclusive_group()
+plan.add_argument("--plan", metavar="FILE", help="Dry run: write the plan and time estimate to FILE")
+plan.add_argument("--execute", metavar="FILE", help="Run a plan saved with --plan instead of scanning source")
 
 print(parser.parse_args())
 args = vars(parser.parse_args())
 print(args)
 
+if args.get("execute"):
+    # source, output і режим — з плану, щоб виконалось саме те, що заплановано
+    saved_plan = load_plan(args["execute"])
+    args.update(source=saved_plan["source"], output=saved_plan["output"], mode=saved_plan["mode"])
+elif not args.get("source"):
+    parser.error("--source is required unless --execute is given")
+
 source = AsyncPath(args.get("source"))
 output = AsyncPath(args.get("output"))
 
-folders = []
+folders: dict[str, asyncio.Task] = {}  # ext -> mkdir, кожна тека створюється один раз
 
 
-async def read_folder(path: AsyncPath) -> None:
-    async for el in path.iterdir(): # noqa
-        if await el.is_dir():
-            await read_folder(el)
-        else:
-            await copy_file(el)
+@dataclass
+class Stats:
+    files: int = 0
+    bytes: int = 0
+    errors: int = 0
+    methods: Counter = field(default_factory=Counter)  # яким способом скопійовано
+    started: float = field(default_factory=perf_counter)
 
+    def report(self) -> str:
+        elapsed = max(perf_counter() - self.started, 1e-9)
+        return (
+            f"{self.files} files, {self.bytes / 2**20:.1f} MB, {self.errors} errors in {elapsed:.2f}s: "
+            f"{self.files / elapsed:.1f} files/s, {self.bytes / 2**20 / elapsed:.1f} MB/s {dict(self.methods)}"
+        )
 
-async def copy_file(file: AsyncPath) -> None:
-    ext = file.suffix[1:]
+
+async def read_folder(path: AsyncPath, queue: asyncio.Queue) -> None:
+    # os.scandir у потоці, порціями: без stat і переходу в потік на кожен файл
+    async for batch in scan(path):
+        for entry in batch:
+            await queue.put(AsyncPath(entry.path))
+
+
+async def read_plan(files: list[dict], queue: asyncio.Queue) -> None:
+    for item in files:
+        await queue.put(AsyncPath(item["path"]))
+
+
+async def make_plan() -> None:
+    plan = await build_plan(Path(source), Path(output), args.get("mode"))
+    plan["estimate"] = await estimate(plan)
+    await asyncio.to_thread(save_plan, plan, args.get("plan"))
+    print(describe(plan))
+
+
+async def ensure_folder(ext: str) -> AsyncPath:
     ext_folder: AsyncPath = output / ext
+    if ext not in folders:
+        folders[ext] = asyncio.create_task(ext_folder.mkdir(exist_ok=True, parents=True))  # noqa
+    await folders[ext]
+    return ext_folder
+
+
+async def copy_file(file: AsyncPath) -> tuple[str, int]:
+    ext = file.suffix[1:]
+    dest = Path(await ensure_folder(ext)) / file.name
+    if args.get("mode") == "move":
+        return await transfer(file, dest, "move")  # move сам не перезаписує dest
+    # Однойменні файли з різних тек копіюються одночасно: кожен пише у свій
+    # тимчасовий файл, а os.replace атомарний — у dest лишиться один цілий файл
+    fd, part = await asyncio.to_thread(tempfile.mkstemp, dir=dest.parent, prefix=f".{dest.name}.", suffix=".part")
+    os.close(fd)
+    try:
+        method, size = await transfer(file, part, args.get("mode"))
+        await asyncio.to_thread(os.replace, part, dest)
+    except OSError:
+        await asyncio.to_thread(Path(part).unlink, missing_ok=True)
+        raise
+    return method, size
+
+
+async def hash_entry(file: AsyncPath, dedup: Deduplicator, entries: list[Entry]) -> tuple[str, int] | None:
+    path = Path(file)
+    stat = await asyncio.to_thread(path.stat)
+    if dedup.is_done(path, stat):
+        return "resumed", 0
+    entries.append((path, stat, await asyncio.to_thread(hash_file, path)))
+    return None  # порахуємо, коли скопіюємо
+
+
+async def dedup_file(item: tuple[Entry, Path], dedup: Deduplicator) -> tuple[str, int]:
+    (path, stat, digest), dest = item
+    await ensure_folder(path.suffix[1:])
+    # Спершу в .part: після аварійної зупинки в output не лишиться обрізаних файлів
+    part = dest.with_name(dest.name + ".part")
+    await asyncio.to_thread(part.unlink, missing_ok=True)  # обрізок від аварійної зупинки; move його не перезапише
+    method, size = await transfer(path, part, args.get("mode"))
+    await asyncio.to_thread(os.replace, part, dest)
+    dedup.commit(path, stat, digest, dest)
+    return method, size
+
+
+async def copy_worker(queue: asyncio.Queue, stats: Stats, handle=copy_file) -> None:
+    while (item := await queue.get()) is not None:
+        try:
+            result = await handle(item)
+            if result is None:
+                continue
+            method, size = result
+            stats.bytes += size
+            stats.files += 1
+            stats.methods[method] += 1
+        except OSError as err:
+            stats.errors += 1
+            logging.error(err)
+
+
+async def run_workers(feed, stats: Stats, handle=copy_file) -> None:
+    queue = asyncio.Queue(args.get("queue_size"))
+    workers = [asyncio.create_task(copy_worker(queue, stats, handle)) for _ in range(args.get("workers"))]
+    await feed(queue)
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+
+async def feed_items(items: list, queue: asyncio.Queue) -> None:
+    for item in items:
+        await queue.put(item)
+
+
+async def run_dedup(feed, stats: Stats) -> None:
+    dedup = Deduplicator(Path(output))
+    await asyncio.to_thread(dedup.open)
     try:
-        await ext_folder.mkdir(exist_ok=True, parents=True)  # noqa
-        await copyfile(file, ext_folder / file.name)
-    except OSError as err:
-        logging.error(err)
+        # Спершу хеші всіх файлів, потім імена — так вони не залежать від порядку
+        entries: list[Entry] = []
+        await run_workers(feed, stats, partial(hash_entry, dedup=dedup, entries=entries))
+        copies, duplicates = await dedup.assign(entries, lambda path: Path(output) / path.suffix[1:])
+        await run_workers(partial(feed_items, copies), stats, partial(dedup_file, dedup=dedup))
+        for path, stat, digest in duplicates:
+            if dedup.duplicate(path, stat, digest):
+                stats.files += 1
+                stats.methods["duplicate"] += 1
+            else:
+                logging.warning(f"{path}: its copy failed, will retry on the next run")
+    finally:
+        dedup.close()
+
+
+async def main() -> Stats:
+    stats = Stats()
+    if args.get("execute"):
+        feed = partial(read_plan, saved_plan["files"])
+    else:
+        feed = partial(read_folder, source)
+    if args.get("dedup"):
+        await run_dedup(feed, stats)
+    else:
+        await run_workers(feed, stats)
+    return stats
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
-    asyncio.run(read_folder(source))
+    if args.get("plan"):
+        asyncio.run(make_plan())
+        raise SystemExit
+    stats = asyncio.run(main())
+    logging.info(stats.report())
@@ -0,0 +1,118 @@
+"""
+План сортування без копіювання: що, куди і скільки це триватиме.
+
+План — JSON зі списком файлів, тож наступний запуск з --execute
+виконує саме його, не скануючи source вдруге.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+from copier import copy
+from scanner import scan
+
+PROBE_FILES = 8
+PROBE_BYTES = 256 * 2**20  # скільки всього копіюємо з найбільших файлів
+
+
+def _existing(path: Path) -> Path:
+    # output може ще не існувати — ФС визначає найближча наявна тека
+    path = path.absolute()
+    while not path.exists():
+        path = path.parent
+    return path
+
+
+async def build_plan(source: Path, output: Path, mode: str) -> dict:
+    files = []
+    summary = defaultdict(lambda: {"files": 0, "bytes": 0})
+    async for batch in scan(source):
+        # stat() у DirEntry кешується, але перший виклик — syscall, тож у потоці
+        sizes = await asyncio.to_thread(lambda: [entry.stat().st_size for entry in batch])
+        for entry, size in zip(batch, sizes):
+            ext = os.path.splitext(entry.name)[1][1:]
+            files.append({"path": entry.path, "ext": ext, "size": size})
+            summary[ext]["files"] += 1
+            summary[ext]["bytes"] += size
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "source": str(source),
+        "output": str(output),
+        "mode": mode,
+        "total": {"files": len(files), "bytes": sum(item["size"] for item in files)},
+        "extensions": dict(sorted(summary.items())),
+        "files": files,
+    }
+
+
+def _probe_sync(files: list[dict], output: Path, sample: int, probe_bytes: int) -> dict:
+    """
+    Копіює кілька найменших файлів (ціна одного файлу) і початки кількох
+    найбільших, разом не більше probe_bytes (пропускна здатність),
+    у тимчасову теку в output і все видаляє.
+    """
+    if not files:
+        return {"per_file": 0.0, "bytes_per_second": None}
+    ordered = sorted(files, key=lambda item: item["size"])
+    small, large = ordered[:sample], ordered[-sample:]
+    # теки, яких ще не було, після заміру прибираємо: план нічого не змінює
+    created = output.absolute()
+    while not created.parent.exists():
+        created = created.parent
+    if created.exists():
+        created = None
+    output.mkdir(parents=True, exist_ok=True)
+    probe_dir = Path(tempfile.mkdtemp(prefix=".plan-probe-", dir=output))
+    try:
+
+        def copy_all(items: list[dict], label: str, limit: int | None = None) -> float:
+            start = perf_counter()
+            for i, item in enumerate(items):
+                copy(item["path"], str(probe_dir / f"{label}-{i}"), limit)
+            return perf_counter() - start
+
+        per_file = copy_all(small, "small") / len(small)
+        limit = max(probe_bytes // len(large), 1)
+        large_bytes = sum(min(item["size"], limit) for item in large)
+        large_time = max(copy_all(large, "large", limit) - per_file * len(large), 1e-9)
+    finally:
+        shutil.rmtree(created or probe_dir, ignore_errors=True)
+    return {"per_file": per_file, "bytes_per_second": large_bytes / large_time if large_bytes else None}
+
+
+async def estimate(plan: dict, sample: int = PROBE_FILES, probe_bytes: int = PROBE_BYTES) -> dict:
+    output = Path(plan["output"])
+    probe = await asyncio.to_thread(_probe_sync, plan["files"], output, sample, probe_bytes)
+    same_fs = os.stat(plan["source"]).st_dev == os.stat(_existing(output)).st_dev
+    # move/hardlink на тій самій ФС не копіюють байти — лишається ціна на файл
+    copies_bytes = plan["mode"] == "copy" or not same_fs
+    seconds = plan["total"]["files"] * probe["per_file"]
+    if copies_bytes and probe["bytes_per_second"]:
+        seconds += plan["total"]["bytes"] / probe["bytes_per_second"]
+    return {**probe, "same_filesystem": same_fs, "seconds": round(seconds, 3)}
+
+
+def save_plan(plan: dict, path: Path) -> None:
+    Path(path).write_text(json.dumps(plan, ensure_ascii=False, indent=1), encoding="utf-8")
+
+
+def load_plan(path: Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def describe(plan: dict) -> str:
+    lines = [f"{plan['source']} -> {plan['output']} ({plan['mode']})"]
+    for ext, item in plan["extensions"].items():
+        lines.append(f"  {ext or '<none>':<10} {item['files']:>8} files {item['bytes'] / 2**20:>10.1f} MB")
+    total = plan["total"]
+    lines.append(f"  {'total':<10} {total['files']:>8} files {total['bytes'] / 2**20:>10.1f} MB")
+    if "estimate" in plan:
+        lines.append(f"  estimated time: {plan['estimate']['seconds']:.1f}s (single stream)")
+    return "\n".join(lines)
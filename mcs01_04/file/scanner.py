@@ -0,0 +1,43 @@
+"""
+Швидкий обхід дерева: os.scandir в окремому потоці.
+
+DirEntry вже знає тип запису (d_type з readdir), тож для розрізнення
+файл/тека не потрібен окремий stat. Один перехід у потік обходить стільки
+тек, скільки потрібно, щоб набрати порцію з batch_size файлів, — замість
+переходу в потік на кожен файл.
+"""
+
+import asyncio
+import logging
+import os
+from typing import AsyncIterator
+
+BATCH_SIZE = 512
+
+
+def _scan_batch(stack: list[str], batch_size: int) -> list[os.DirEntry]:
+    batch = []
+    while stack and len(batch) < batch_size:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        batch.append(entry)
+        except OSError as err:
+            logging.error(err)
+    return batch
+
+
+async def scan(root, batch_size: int = BATCH_SIZE) -> AsyncIterator[list[os.DirEntry]]:
+    """
+    Порції файлів (DirEntry) з усього дерева root. Наступна порція читається
+    лише коли споживач попросив її, тож обхід не випереджає копіювання.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        batch = await asyncio.to_thread(_scan_batch, stack, batch_size)
+        if batch:
+            yield batch
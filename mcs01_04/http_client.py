@@ -0,0 +1,105 @@
+import asyncio
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    limit: int = 100  # всього з'єднань
+    limit_per_host: int = 10
+    keepalive: float = 30.0  # скільки тримати idle з'єднання, сек
+    timeout: float = 10.0  # загальний timeout запиту, сек
+
+
+class ClientManager(ABC):
+    """
+    Один пул з'єднань (сесія) на event loop.
+
+    Сесія створюється ліниво при першому get() і живе до close(),
+    тому DNS/TCP/TLS для того самого хоста робляться один раз.
+    """
+
+    def __init__(self, config: PoolConfig = None):
+        self.config = config or PoolConfig()
+        self._clients = weakref.WeakKeyDictionary()  # loop -> client
+
+    def configure(self, **kwargs) -> None:
+        """Змінює налаштування для сесій, що будуть створені після виклику."""
+        self.config = replace(self.config, **kwargs)
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or self._is_closed(client):
+            client = self._create()
+            self._clients[loop] = client
+        return client
+
+    async def close(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None and not self._is_closed(client):
+            await self._close(client)
+
+    async def __aenter__(self):
+        return self.get()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @abstractmethod
+    def _create(self):
+        """Нова сесія з налаштуваннями self.config."""
+
+    @abstractmethod
+    def _is_closed(self, client) -> bool:
+        ...
+
+    @abstractmethod
+    async def _close(self, client) -> None:
+        ...
+
+
+class AiohttpManager(ClientManager):
+    def _create(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=self.config.limit,
+            limit_per_host=self.config.limit_per_host,
+            keepalive_timeout=self.config.keepalive,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+        )
+
+    def _is_closed(self, client) -> bool:
+        return client.closed
+
+    async def _close(self, client) -> None:
+        await client.close()
+
+
+class HttpxManager(ClientManager):
+    def _create(self):
+        import httpx
+
+        # httpx не має ліміту "на хост", тому limit_per_host обмежує keep-alive з'єднання
+        limits = httpx.Limits(
+            max_connections=self.config.limit,
+            max_keepalive_connections=self.config.limit_per_host,
+            keepalive_expiry=self.config.keepalive,
+        )
+        return httpx.AsyncClient(limits=limits, timeout=self.config.timeout)
+
+    def _is_closed(self, client) -> bool:
+        return client.is_closed
+
+    async def _close(self, client) -> None:
+        await client.aclose()
+
+
+aiohttp_clients = AiohttpManager()
+httpx_clients = HttpxManager()
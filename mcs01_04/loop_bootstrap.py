@@ -0,0 +1,43 @@
+import asyncio
+import platform
+from typing import Any, Callable, Coroutine
+
+try:
+    import uvloop  # pip install uvloop (Linux/macOS)
+except ImportError:
+    uvloop = None
+
+SLOW_CALLBACK = 0.1  # в debug режимі логуються callback-и, довші за це, сек
+
+
+def loop_factory() -> Callable[[], asyncio.AbstractEventLoop]:
+    """Найшвидша доступна реалізація event loop."""
+    if uvloop is not None:
+        return uvloop.new_event_loop
+    if platform.system() == "Windows":
+        # Proactor loop на Windows погано дружить з aiohttp/httpx
+        return asyncio.SelectorEventLoop
+    return asyncio.new_event_loop
+
+
+def _configured(debug: bool = None, slow_callback: float = SLOW_CALLBACK) -> asyncio.AbstractEventLoop:
+    loop = loop_factory()()
+    if debug is not None:
+        loop.set_debug(debug)
+    loop.slow_callback_duration = slow_callback
+    return loop
+
+
+def new_loop(debug: bool = None, slow_callback: float = SLOW_CALLBACK) -> asyncio.AbstractEventLoop:
+    """Loop для ручного run_forever/run_until_complete, встановлений як поточний."""
+    loop = _configured(debug, slow_callback)
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+def run(main: Coroutine, debug: bool = None, slow_callback: float = SLOW_CALLBACK) -> Any:
+    """Замість asyncio.run(main): той самий життєвий цикл, але з вибором loop."""
+    # Runner з власною loop_factory не скидає поточний loop після close(),
+    # тож фабрика його й не встановлює — інакше лишився б закритий loop
+    with asyncio.Runner(debug=debug, loop_factory=lambda: _configured(debug, slow_callback)) as runner:
+        return runner.run(main)
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from bisect import bisect_left
+
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+class LoopLagMonitor:
+    """
+    Кожні interval секунд "прокидається" і міряє, наскільки пізніше
+    запланованого це сталося. Велика затримка означає, що event loop
+    був зайнятий блокуючим кодом (наприклад, calculate() без executor).
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, buckets: tuple[float, ...] = BUCKETS):
+        self.interval = interval
+        self.threshold = threshold
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # остання — більше за всі межі
+        self.samples = 0
+        self.max_lag = 0.0
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> asyncio.Task:
+        self.task = asyncio.get_running_loop().create_task(self.run())
+        return self.task
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def record(self, lag: float) -> None:
+        self.counts[bisect_left(self.buckets, lag)] += 1
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.threshold:
+            logging.warning(f"Event loop lag {lag:.3f}s (threshold {self.threshold}s)")
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def histogram(self) -> dict[str, int]:
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return dict(zip(labels, self.counts))
+
+    def report(self) -> str:
+        return f"samples={self.samples} max={self.max_lag:.4f}s {self.histogram()}"
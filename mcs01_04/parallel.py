@@ -0,0 +1,59 @@
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable
+
+import process_pool
+
+
+async def parallel_map_reduce(
+    func: Callable,
+    tasks: Iterable,
+    split: Callable[[Any, int], list],
+    reduce: Callable[[list], Any],
+    executor: Executor = None,
+    workers: int = None,
+    chunks_per_worker: int = 4,
+    size: Callable[[Any], float] = None,
+) -> list:
+    """
+    Великі задачі ріжуться на шматки split(task, n), шматки виконуються
+    в процесах через func, а результати кожної задачі зводяться reduce().
+
+    Шматки лежать у спільній черзі (найбільші за size задачі першими), і в роботі
+    одночасно не більше workers шматків: воркер, що звільнився, одразу бере
+    наступний, тож жодне ядро не простоює, поки інше добиває довгу задачу.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or process_pool.get_pool()
+    workers = workers or os.cpu_count()
+    tasks = list(tasks)
+
+    pieces = max(1, workers * chunks_per_worker // max(1, len(tasks)))
+    order = range(len(tasks))
+    if size is not None:
+        order = sorted(order, key=lambda i: size(tasks[i]), reverse=True)
+    queue = [(i, chunk) for i in order for chunk in split(tasks[i], pieces)]
+    queue.reverse()  # pop() з кінця списку — O(1)
+    parts: list[list] = [[] for _ in tasks]
+
+    in_flight = {}
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < workers:
+                i, chunk = queue.pop()
+                in_flight[loop.run_in_executor(executor, func, chunk)] = i
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                parts[in_flight.pop(future)].append(future.result())
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+    return [reduce(part) for part in parts]
+
+
+def split_range(counter: int, pieces: int) -> list[int]:
+    """Ділить число на pieces майже рівних доданків."""
+    size, rest = divmod(counter, pieces)
+    return [size + (1 if i < rest else 0) for i in range(pieces) if size or i < rest]
@@ -0,0 +1,162 @@
+"""
+Декларативний конвеєр: source -> map -> ... -> sink.
+
+    await Pipeline(urls).map(fetch, concurrency=10).map(parse, concurrency=2, ordered=True).sink(save).run()
+
+Між етапами — обмежені черги (backpressure), перша помилка будь-якого
+етапу зупиняє весь конвеєр і піднімається з run(), а після вичерпання
+source кожен етап дочищає свою чергу і завершується сам.
+"""
+
+import asyncio
+from collections.abc import AsyncIterable
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Iterable
+
+from work_queue import StageMetrics
+
+END = object()  # кінець потоку
+
+
+class _Stage:
+    def __init__(self, func: Callable[[Any], Awaitable], concurrency: int, ordered: bool, buffer: int, name: str):
+        self.func = func
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.queue = asyncio.Queue(buffer)
+        self.metrics = StageMetrics(name)
+
+    async def put(self, item) -> None:
+        start = perf_counter()
+        await self.queue.put(item)
+        self.metrics.put_wait += perf_counter() - start
+        self.metrics.put += 1
+        self.metrics.max_depth = max(self.metrics.max_depth, self.queue.qsize())
+
+    async def run(self, output: "_Stage | None") -> None:
+        pending: dict[int, Any] = {}  # seq -> результат, що чекає на свою чергу
+        in_flight: set[int] = set()  # seq, які зараз обробляють воркери цього етапу
+        next_seq = 0
+        window = self.concurrency * 2
+        advanced = asyncio.Condition()
+
+        def may_take() -> bool:
+            # Вхід гальмуємо, лише коли відстає наш власний воркер: він допрацює
+            # без нових елементів. Якщо пропущений seq ще вище по конвеєру,
+            # блокування входу — дедлок (він не зможе покласти його в нашу чергу),
+            # тож тоді буфер перестановки росте.
+            return len(pending) < window or next_seq not in in_flight
+
+        async def emit(seq: int, value) -> None:
+            nonlocal next_seq
+            if output is None:
+                return
+            if not self.ordered:
+                await output.put((seq, value))
+                return
+            pending[seq] = value
+            while next_seq in pending:
+                await output.put((next_seq, pending.pop(next_seq)))
+                next_seq += 1
+            async with advanced:
+                advanced.notify_all()
+
+        async def worker() -> None:
+            while True:
+                if self.ordered:
+                    async with advanced:
+                        await advanced.wait_for(may_take)
+                item = await self.queue.get()
+                if item is END:
+                    await self.queue.put(END)  # для інших воркерів етапу
+                    return
+                seq, value = item
+                in_flight.add(seq)
+                try:
+                    result = await self.func(value)
+                except Exception:
+                    self.metrics.errors += 1
+                    raise
+                in_flight.discard(seq)
+                self.metrics.processed += 1
+                self.metrics.batches += 1
+                await emit(seq, result)
+
+        self.metrics.started = perf_counter()
+        await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+        if output is not None:
+            await output.queue.put(END)
+
+
+class Pipeline:
+    def __init__(self, source: Iterable | AsyncIterable, buffer: int = 100):
+        self.source = source
+        self.buffer = buffer
+        self.stages: list[_Stage] = []
+        self.count = 0
+
+    def map(self, func: Callable[[Any], Awaitable], concurrency: int = 1, ordered: bool = False, name: str = None):
+        self.stages.append(_Stage(func, concurrency, ordered, self.buffer, name or func.__name__))
+        return self
+
+    def sink(self, func: Callable[[Any], Awaitable], concurrency: int = 1, name: str = None):
+        # sink — той самий етап, але останній: його результати нікуди не йдуть
+        return self.map(func, concurrency, ordered=False, name=name)
+
+    @property
+    def metrics(self) -> list[StageMetrics]:
+        return [stage.metrics for stage in self.stages]
+
+    async def _feed(self, stage: _Stage) -> None:
+        if isinstance(self.source, AsyncIterable):
+            async for value in self.source:
+                await self._put(stage, value)
+        else:
+            for value in self.source:
+                await self._put(stage, value)
+        await stage.queue.put(END)
+
+    async def _put(self, stage: _Stage, value) -> None:
+        await stage.put((self.count, value))
+        self.count += 1
+
+    async def run(self) -> int:
+        """Проганяє всі елементи source через етапи, повертає їх кількість."""
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+        outputs = self.stages[1:] + [None]
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._feed(self.stages[0]))
+                for stage, output in zip(self.stages, outputs):
+                    group.create_task(stage.run(output))
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0] from None
+        return self.count
+
+
+async def check(items: int = 2000, concurrency: int = 32, buffer: int = 4) -> None:
+    """
+    Стрес-перевірка: невпорядкований етап з великою конкурентністю і
+    випадковими затримками живить впорядкований етап з маленькими чергами.
+    """
+    import random
+
+    async def jitter(value):
+        await asyncio.sleep(random.random() / 1000)
+        return value
+
+    received = []
+
+    async def collect(value):
+        received.append(value)
+
+    pipeline = (
+        Pipeline(range(items), buffer=buffer)
+        .map(jitter, concurrency=concurrency)
+        .map(jitter, concurrency=4, ordered=True)
+        .sink(collect)
+    )
+    async with asyncio.timeout(60):
+        await pipeline.run()
+    assert received == list(range(items)), "ordered stage lost or reordered items"
@@ -0,0 +1,129 @@
+"""
+Сума i**power для i in range(10**p) — кілька реалізацій з однаковим (точним) результатом.
+
+list       — оригінал з 06_bounds: весь список у пам'яті
+generator  — той самий цикл, але O(1) пам'яті
+numpy      — векторно: int64, а для великих сум — за модулями простих чисел + КТЗ
+faulhaber  — формула Фаульгабера через числа Бернуллі, O(power**2) замість O(10**p)
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from math import comb, isqrt, prod
+
+try:
+    import numpy as np
+except ImportError:  # numpy — необов'язкова залежність
+    np = None
+
+
+def calculate_list(power: int, p: int) -> int:
+    r = [i**power for i in range(10**p)]
+    return sum(r)
+
+
+def calculate_generator(power: int, p: int) -> int:
+    return sum(i**power for i in range(10**p))
+
+
+@lru_cache(maxsize=None)
+def bernoulli(m: int) -> Fraction:
+    """Числа Бернуллі з B(1) = -1/2."""
+    if m == 0:
+        return Fraction(1)
+    return -sum(comb(m + 1, j) * bernoulli(j) for j in range(m)) / (m + 1)
+
+
+def calculate_faulhaber(power: int, p: int) -> int:
+    # sum_{i=0}^{n-1} i^k = 1/(k+1) * sum_{j=0}^{k} C(k+1, j) * B(j) * n^(k+1-j)
+    n = 10**p
+    total = sum(comb(power + 1, j) * bernoulli(j) * n ** (power + 1 - j) for j in range(power + 1))
+    result = total / (power + 1)
+    assert result.denominator == 1
+    return int(result)
+
+
+def _primes_below(limit: int, count: int) -> list[int]:
+    def is_prime(x: int) -> bool:
+        return x > 1 and all(x % d for d in range(2, isqrt(x) + 1))
+
+    primes = []
+    candidate = limit - 1
+    while len(primes) < count:
+        if is_prime(candidate):
+            primes.append(candidate)
+        candidate -= 1
+    return primes
+
+
+def _pow_mod(x, power: int, m: int):
+    # x < m < 2**31, тому добуток двох залишків вміщається в uint64
+    result = np.ones_like(x)
+    while power:
+        if power & 1:
+            result *= x
+            np.remainder(result, m, out=result)
+        x = x * x
+        np.remainder(x, m, out=x)
+        power >>= 1
+    return result
+
+
+def calculate_numpy(power: int, p: int, chunk: int = 1 << 20) -> int:
+    """
+    Якщо результат вміщається в int64 — рахуємо напряму. Інакше (int64
+    переповнюється вже на 20**15) рахуємо суму за модулями кількох простих
+    < 2**31 (векторно, порціями по chunk) і відновлюємо точне значення
+    через китайську теорему про залишки.
+    """
+    if np is None:
+        raise ImportError("numpy backend requires numpy: pip install numpy")
+    n = 10**p
+    bound = n * max(n - 1, 1) ** power + 1  # результат гарантовано менший
+    if bound < 2**63:
+        # Малі степені: звичайна сума в int64 без жодних модулів
+        return sum(
+            int((np.arange(start, min(n, start + chunk), dtype=np.int64) ** power).sum())
+            for start in range(0, n, chunk)
+        )
+
+    # кожне просте > 2**30, тож їх добуток гарантовано більший за bound
+    primes = _primes_below(2**31, bound.bit_length() // 30 + 1)
+
+    residues = []
+    for m in primes:
+        total = 0
+        for start in range(0, n, chunk):
+            x = np.arange(start, min(n, start + chunk), dtype=np.uint64) % np.uint64(m)
+            total += int(_pow_mod(x, power, m).sum(dtype=np.uint64))
+        residues.append(total % m)
+
+    modulus = prod(primes)
+    result = 0
+    for r, m in zip(residues, primes):
+        rest = modulus // m
+        result += r * rest * pow(rest, -1, m)
+    return result % modulus
+
+
+BACKENDS = {
+    "list": calculate_list,
+    "generator": calculate_generator,
+    "numpy": calculate_numpy,
+    "faulhaber": calculate_faulhaber,
+}
+
+
+def calculate(power: int, p: int, backend: str = "generator") -> int:
+    return BACKENDS[backend](power, p)
+
+
+def check(max_power: int = 20, max_p: int = 3) -> None:
+    """Звіряє всі бекенди з оригінальним list до останнього біта."""
+    backends = [name for name in BACKENDS if name != "numpy" or np is not None]
+    for power in range(max_power + 1):
+        for p in range(max_p + 1):
+            expected = calculate_list(power, p)
+            for name in backends:
+                got = calculate(power, p, name)
+                assert got == expected, f"{name}: power={power} p={p}: {got} != {expected}"
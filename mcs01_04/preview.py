@@ -0,0 +1,74 @@
+import asyncio
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from http_client import aiohttp_clients
+
+ALLOWED_SCHEMES = {"http", "https"}
+
+
+class PreviewError(Exception):
+    pass
+
+
+def validate_url(url: str) -> None:
+    """Відсікає "asdf", "ws://..." тощо ще до мережевого запиту."""
+    parts = urlsplit(url)
+    if parts.scheme not in ALLOWED_SCHEMES or not parts.netloc:
+        raise PreviewError(f"Unsupported url: {url}")
+
+
+async def get_preview(url: str, size: int = 25, timeout: float = 10) -> tuple[str, str]:
+    """
+    Повертає перші size символів сторінки.
+
+    Читається лише початок тіла (до 4 байт на символ UTF-8),
+    після чого з'єднання закривається без дочитування решти.
+    """
+    validate_url(url)
+    limit = size * 4
+    session = aiohttp_clients.get()
+    try:
+        async with asyncio.timeout(timeout):
+            async with session.get(url) as resp:
+                data = b""
+                while len(data) < limit:
+                    chunk = await resp.content.read(limit - len(data))
+                    if not chunk:
+                        break
+                    data += chunk
+                encoding = resp.charset or "utf-8"
+                resp.close()
+    except (aiohttp.ClientError, TimeoutError) as err:
+        raise PreviewError(f"{url}: {err!r}") from err
+    try:
+        text = data.decode(encoding, errors="ignore")
+    except LookupError:
+        # невідомий charset у Content-Type (на кшталт "bogus-enc")
+        text = data.decode("utf-8", errors="ignore")
+    return url, text[:size]
+
+
+async def preview_all(
+    urls: Iterable[str], size: int = 25, timeout: float = 10, concurrency: int = 100
+) -> list[tuple[str, str] | PreviewError]:
+    """
+    Превʼю для всіх urls у тому ж порядку; помилки повертаються як PreviewError.
+
+    Працює фіксована кількість воркерів, тож на 10k адрес не створюється 10k задач.
+    """
+    urls = list(urls)
+    results: list = [None] * len(urls)
+    indexes = iter(range(len(urls)))
+
+    async def worker():
+        for i in indexes:
+            try:
+                results[i] = await get_preview(urls[i], size, timeout)
+            except PreviewError as err:
+                results[i] = err
+
+    await asyncio.gather(*[worker() for _ in range(min(concurrency, len(urls)))])
+    return results
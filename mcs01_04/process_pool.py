@@ -0,0 +1,86 @@
+"""
+Один спільний ProcessPoolExecutor на весь застосунок.
+
+Пул стартує ліниво при першому використанні і живе до кінця процесу,
+тож кожна порція задач не платить за запуск процесів та імпорти.
+"""
+
+import asyncio
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable
+
+_pool: ProcessPoolExecutor | None = None
+_settings = {"max_workers": os.cpu_count(), "max_tasks_per_child": None}
+
+
+def configure(max_workers: int = None, max_tasks_per_child: int = None) -> None:
+    """Налаштування діють лише до першого get_pool()."""
+    if _pool is not None:
+        raise RuntimeError("Process pool is already started")
+    if max_workers is not None:
+        _settings["max_workers"] = max_workers
+    if max_tasks_per_child is not None:
+        _settings["max_tasks_per_child"] = max_tasks_per_child
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(**_settings)
+    return _pool
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _run_chunk(func: Callable, chunk: list) -> list:
+    return [func(item) for item in chunk]
+
+
+async def warm_up() -> set[int]:
+    """Піднімає всі процеси заздалегідь, повертає їх pid."""
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    futures = [loop.run_in_executor(pool, _worker_pid) for _ in range(_settings["max_workers"])]
+    return set(await asyncio.gather(*futures))
+
+
+async def run_in_pool(func: Callable, *args) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pool(), func, *args)
+
+
+async def map_chunked(func: Callable, items: Iterable, chunksize: int = 100) -> list:
+    """
+    Аналог map(func, items) у пулі. Дрібні задачі передаються порціями
+    по chunksize, щоб не платити за pickle та IPC на кожен елемент.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    items = iter(items)
+    futures = []
+    while chunk := list(islice(items, chunksize)):
+        futures.append(loop.run_in_executor(pool, _run_chunk, func, chunk))
+    results = []
+    for part in await asyncio.gather(*futures):
+        results.extend(part)
+    return results
+
+
+def shutdown(wait: bool = True, cancel_futures: bool = False) -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+        _pool = None
+
+
+async def aclose() -> None:
+    """Зупинка пулу з event loop без блокування самого loop."""
+    await asyncio.to_thread(shutdown)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,35 @@
+import json
+import sqlite3
+
+
+class RatesCache:
+    """
+    Курси за минулі дні не змінюються, тому їх достатньо отримати один раз.
+    Ключ — дата у форматі API (dd.mm.YYYY), значення — JSON відповіді.
+    """
+
+    def __init__(self, path: str = "rates.db"):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS rates (date TEXT PRIMARY KEY, payload TEXT NOT NULL)")
+
+    def get_many(self, dates: list[str]) -> dict[str, dict]:
+        if not dates:
+            return {}
+        placeholders = ", ".join("?" * len(dates))
+        rows = self.conn.execute(f"SELECT date, payload FROM rates WHERE date IN ({placeholders})", dates)
+        return {date: json.loads(payload) for date, payload in rows}
+
+    def put(self, date: str, payload: dict) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rates (date, payload) VALUES (?, ?)", (date, json.dumps(payload))
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,100 @@
+import asyncio
+import random
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 0.1  # перша пауза між спробами, сек
+    max_delay: float = 2.0
+    multiplier: float = 2.0
+    jitter: bool = True  # "full jitter": пауза випадкова в [0, delay]
+    attempt_timeout: float | None = 5.0  # на одну спробу
+    deadline: float | None = 15.0  # на всі спроби разом з паузами
+    retry_on: tuple[type[BaseException], ...] = (TimeoutError,)
+    hedge: bool = False  # дублювати запит, якщо він довший за p95
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20  # поки замірів мало, не дублюємо
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class LatencyTracker:
+    """Ковзне вікно останніх успішних часів відповіді."""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _timed_call(make_call: Callable[[], Awaitable], policy: RetryPolicy, tracker: LatencyTracker | None):
+    start = perf_counter()
+    async with asyncio.timeout(policy.attempt_timeout):
+        result = await make_call()
+    if tracker is not None:
+        tracker.add(perf_counter() - start)
+    return result
+
+
+def _hedge_delay(policy: RetryPolicy, tracker: LatencyTracker | None) -> float | None:
+    if not policy.hedge or tracker is None or len(tracker.samples) < policy.hedge_min_samples:
+        return None
+    return tracker.quantile(policy.hedge_quantile)
+
+
+async def _attempt(make_call: Callable[[], Awaitable], policy: RetryPolicy, tracker: LatencyTracker | None):
+    delay = _hedge_delay(policy, tracker)
+    if delay is None:
+        return await _timed_call(make_call, policy, tracker)
+
+    tasks = {asyncio.create_task(_timed_call(make_call, policy, tracker))}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            # Перший запит "застряг" довше за p95 — відправляємо дубль
+            tasks.add(asyncio.create_task(_timed_call(make_call, policy, tracker)))
+        error = None
+        pending = tasks
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_with_retry(
+    make_call: Callable[[], Awaitable], policy: RetryPolicy = RetryPolicy(), tracker: LatencyTracker = None
+) -> Any:
+    """
+    Викликає make_call() згідно з policy.
+
+    Повторює лише винятки з policy.retry_on, з експоненційною паузою та jitter.
+    Після policy.deadline секунд піднімає TimeoutError.
+    """
+    async with asyncio.timeout(policy.deadline):
+        for attempt in range(policy.attempts):
+            try:
+                return await _attempt(make_call, policy, tracker)
+            except policy.retry_on:
+                if attempt == policy.attempts - 1:
+                    raise
+            await asyncio.sleep(policy.backoff(attempt))
@@ -0,0 +1,37 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Hashable
+
+
+@dataclass
+class ScatterResult:
+    results: dict = field(default_factory=dict)  # key -> результат
+    errors: dict = field(default_factory=dict)  # key -> виняток
+    stragglers: list = field(default_factory=list)  # keys, що не встигли до дедлайну
+
+
+async def scatter_gather(calls: dict[Hashable, Awaitable], deadline: float) -> ScatterResult:
+    """
+    Запускає всі calls одночасно і чекає не довше deadline секунд.
+
+    Повертає те, що встигло завершитися. Решта задач скасовується і не
+    очікується: корутини отримують CancelledError, а future з executor,
+    які ще не почали виконуватись, знімаються з черги пулу.
+    """
+    tasks = {asyncio.ensure_future(aw): key for key, aw in calls.items()}
+    result = ScatterResult()
+    if not tasks:
+        return result
+
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task, key in tasks.items():
+        if task in pending:
+            task.cancel()
+            result.stragglers.append(key)
+        elif task.cancelled():
+            result.errors[key] = asyncio.CancelledError()
+        elif task.exception() is not None:
+            result.errors[key] = task.exception()
+        else:
+            result.results[key] = task.result()
+    return result
@@ -0,0 +1,99 @@
+import asyncio
+from typing import Callable
+
+from aiofile import async_open
+from aiopath import AsyncPath
+
+CHUNK_SIZE = 64 * 1024
+MAX_IN_FLIGHT = 4 * 1024 * 1024  # прочитано, але ще не записано
+READAHEAD = 8  # скільки файлів читаються наперед одночасно
+
+
+class ByteBudget:
+    """Семафор у байтах: обмежує обсяг даних між читанням і записом."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self, n: int, urgent: Callable[[], bool] = lambda: False) -> None:
+        # urgent: файл, який зараз пише writer, не може чекати на інші, якщо
+        # writer чекає саме на нього, — інакше читачі наперед вичерпали б бюджет
+        # і все зупинилось би
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.used + n <= self.limit or urgent())
+            self.used += n
+
+    async def release(self, n: int) -> None:
+        async with self.condition:
+            self.used -= n
+            self.condition.notify_all()
+
+
+async def list_files(folder: AsyncPath, pattern: str = "**/*.js") -> list[AsyncPath]:
+    # Сортування дає однаковий порядок у main.js незалежно від ФС і швидкості читання
+    return sorted([file async for file in folder.glob(pattern)])
+
+
+async def bundle(
+    files: list[AsyncPath],
+    output: str,
+    chunk_size: int = CHUNK_SIZE,
+    max_in_flight: int = MAX_IN_FLIGHT,
+    readahead: int = READAHEAD,
+) -> int:
+    """
+    Склеює files в output саме в цьому порядку (після кожного файлу — "\\n"),
+    читаючи й записуючи шматками по chunk_size. У пам'яті одночасно не більше
+    max_in_flight байт (плюс один шматок поточного файлу). Повертає кількість байт.
+    """
+    budget = ByteBudget(max_in_flight)
+    queues = [asyncio.Queue() for _ in files]
+    slots = asyncio.Semaphore(readahead)
+    head = 0  # індекс файлу, який зараз пише writer
+
+    async def reader(index: int) -> None:
+        try:
+            async with async_open(files[index], "rb") as afd:
+                while True:
+                    # поза бюджетом — лише коли writer уже все забрав: так наперед
+                    # лежить не більше одного шматка поточного файлу
+                    await budget.acquire(chunk_size, urgent=lambda: index == head and queues[index].empty())
+                    chunk = await afd.read(chunk_size)
+                    await budget.release(chunk_size - len(chunk))
+                    if not chunk:
+                        break
+                    await queues[index].put(chunk)
+        finally:
+            await queues[index].put(None)
+            slots.release()
+
+    async def launcher() -> None:
+        for index in range(len(files)):
+            await slots.acquire()
+            tasks.append(asyncio.create_task(reader(index)))
+
+    tasks: list[asyncio.Task] = []
+    launch_task = asyncio.create_task(launcher())
+    written = 0
+    try:
+        async with async_open(output, "wb") as out:
+            for index in range(len(files)):
+                head = index
+                async with budget.condition:
+                    budget.condition.notify_all()
+                while (chunk := await queues[index].get()) is not None:
+                    await out.write(chunk)
+                    written += len(chunk)
+                    await budget.release(len(chunk))
+                await out.write(b"\n")
+                written += 1
+        await launch_task
+        for task in tasks:
+            await task  # піднімає помилки читання, якщо вони були
+    finally:
+        launch_task.cancel()
+        for task in tasks:
+            task.cancel()
+    return written
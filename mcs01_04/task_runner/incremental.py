@@ -0,0 +1,137 @@
+"""
+Інкрементальна збірка main.js.
+
+Поруч з output зберігається маніфест: для кожного вхідного файлу — mtime, розмір,
+sha256 та місце (offset, length) його вмісту в output. При наступній збірці
+незмінені файли не читаються: їх шматки копіюються зі старого output.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def manifest_path(output: Path) -> Path:
+    return output.with_name(output.name + ".manifest.json")
+
+
+def load_manifest(output: Path) -> dict:
+    try:
+        return json.loads(manifest_path(output).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy(src, dst, length: int) -> None:
+    while length > 0:
+        chunk = src.read(min(CHUNK_SIZE, length))
+        if not chunk:
+            raise OSError("Unexpected end of cached output")
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+def _output_is_valid(output: Path, manifest: dict) -> bool:
+    # Якщо output змінили руками, шматкам з нього довіряти не можна
+    try:
+        stat = output.stat()
+    except OSError:
+        return False
+    return stat.st_mtime_ns == manifest.get("output_mtime_ns") and stat.st_size == manifest.get("output_size")
+
+
+def rebuild_sync(files: list[Path], output: Path) -> dict:
+    manifest = load_manifest(output)
+    cached = manifest["files"] if _output_is_valid(output, manifest) else {}
+
+    entries, changed, present = {}, [], []
+    for path in files:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue  # видалили або атомарно перейменували після glob
+        present.append(path)
+        old = cached.get(str(path))
+        if old and old["mtime_ns"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+            entries[str(path)] = old
+            continue
+        if old and old["sha256"] == file_hash(path):
+            # "touch" без зміни вмісту — лише оновлюємо mtime
+            entries[str(path)] = {**old, "mtime_ns": stat.st_mtime_ns}
+            continue
+        entries[str(path)] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": None}
+        changed.append(path)
+
+    if not changed and list(entries) == list(cached):
+        if entries != cached:
+            manifest["files"] = entries
+            manifest_path(output).write_text(json.dumps(manifest), encoding="utf-8")
+        return {"files": len(present), "changed": 0, "rebuilt": False}
+
+    tmp = output.with_name(output.name + ".tmp")
+    old_output = open(output, "rb") if cached else None
+    try:
+        with open(tmp, "wb") as out:
+            for path in present:
+                entry = entries[str(path)]
+                offset = out.tell()
+                if entry["sha256"] is not None:
+                    old_output.seek(entry["offset"])
+                    _copy(old_output, out, entry["length"])
+                else:
+                    digest = hashlib.sha256()
+                    with open(path, "rb") as src:
+                        while chunk := src.read(CHUNK_SIZE):
+                            digest.update(chunk)
+                            out.write(chunk)
+                    entry["sha256"] = digest.hexdigest()
+                out.write(b"\n")
+                entry["offset"], entry["length"] = offset, out.tell() - offset - 1
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        if old_output is not None:
+            old_output.close()
+
+    os.replace(tmp, output)
+    stat = output.stat()
+    manifest = {"output_mtime_ns": stat.st_mtime_ns, "output_size": stat.st_size, "files": entries}
+    manifest_path(output).write_text(json.dumps(manifest), encoding="utf-8")
+    return {"files": len(present), "changed": len(changed), "rebuilt": True}
+
+
+async def rebuild(folder: Path, output: Path, pattern: str = "**/*.js") -> dict:
+    """stat/hash/копіювання — сотні дрібних блокуючих викликів, тож усе в одному потоці."""
+
+    def run() -> dict:
+        return rebuild_sync(sorted(folder.glob(pattern)), output)
+
+    return await asyncio.to_thread(run)
+
+
+async def watch(folder: Path, output: Path, interval: float = 1.0, pattern: str = "**/*.js") -> None:
+    while True:
+        try:
+            result = await rebuild(folder, output, pattern)
+        except OSError as err:
+            # файл зник посеред збірки — наступний прохід збере вже новий стан
+            logging.error(f"Rebuild of {output} failed: {err}")
+            await asyncio.sleep(interval)
+            continue
+        if result["rebuilt"]:
+            print(f"Rebuilt {output}: {result['changed']} of {result['files']} files changed")
+        await asyncio.sleep(interval)
@@ -1,9 +1,14 @@
+import argparse
 import asyncio
 import logging
+from pathlib import Path
 
 from aiopath import AsyncPath
 from aiofile import async_open
 
+from bundler import bundle, list_files, CHUNK_SIZE, MAX_IN_FLIGHT
+from incremental import rebuild, watch
+
 
 async def producer(file: AsyncPath, q: asyncio.Queue):
     print("start", file.name)
@@ -17,10 +22,11 @@ async def producer(file: AsyncPath, q: asyncio.Queue):
 
 async def consumer(filename, q: asyncio.Queue):
     async with async_open(filename, 'w', encoding='utf-8') as afd:
-        while True:
-            file, blob = await q.get()
+        while (item := await q.get()) is not None:
+            file, blob = item
             await afd.write(f"{blob}\n")
             q.task_done()
+        q.task_done()
 
 
 async def main():
@@ -32,12 +38,38 @@ async def main():
     consumer_task = asyncio.create_task(consumer("main.js", queue_files))
 
     await asyncio.gather(*producer_tasks)
-    await queue_files.join()
-    consumer_task.cancel()
+    # None — сигнал завершення: consumer дописує все з черги і сам закриває файл
+    await queue_files.put(None)
+    await consumer_task
+
+
+async def main_stream(chunk_size: int, max_in_flight: int):
+    files = await list_files(AsyncPath(".").joinpath("files"))
+    written = await bundle(files, "main.js", chunk_size, max_in_flight)
+    print(f"{len(files)} files, {written} bytes -> main.js")
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Bundle files/**/*.js into main.js")
+    parser.add_argument("--stream", action="store_true", help="Stream files in sorted order with bounded memory")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT, help="Max bytes read but not yet written")
+    parser.add_argument("--incremental", action="store_true", help="Rebuild only what changed since the last run")
+    parser.add_argument("--watch", action="store_true", help="Keep rebuilding incrementally on changes")
+    parser.add_argument("--interval", type=float, default=1.0, help="Watch polling interval, seconds")
+    args = parser.parse_args()
+
+    if args.watch:
+        try:
+            asyncio.run(watch(Path("files"), Path("main.js"), args.interval))
+        except KeyboardInterrupt:
+            pass
+    elif args.incremental:
+        print(asyncio.run(rebuild(Path("files"), Path("main.js"))))
+    elif args.stream:
+        asyncio.run(main_stream(args.chunk_size, args.max_in_flight))
+    else:
+        asyncio.run(main())
 
 
 
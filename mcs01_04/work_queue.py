@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Awaitable, Callable
+
+STOP = object()  # poison pill: воркер, що його отримав, завершується
+
+
+class BatchQueue(asyncio.Queue):
+    async def get_many(self, n: int, timeout: float = None) -> list:
+        """
+        Чекає хоча б на один елемент, потім добирає до n елементів,
+        але не довше timeout секунд (None — лише те, що вже є в черзі).
+        """
+        items = [await self.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or 0)
+        while len(items) < n:
+            if not self.empty():
+                items.append(self.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                async with asyncio.timeout(remaining):
+                    items.append(await self.get())
+            except TimeoutError:
+                break
+        return items
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    put: int = 0
+    processed: int = 0
+    batches: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    put_wait: float = 0.0  # скільки продюсери простояли на повній черзі
+    started: float = field(default_factory=perf_counter)
+
+    def throughput(self) -> float:
+        return self.processed / max(perf_counter() - self.started, 1e-9)
+
+    def report(self) -> str:
+        avg_batch = self.processed / self.batches if self.batches else 0
+        return (
+            f"[{self.name}] put={self.put} processed={self.processed} errors={self.errors} "
+            f"throughput={self.throughput():.1f}/s avg_batch={avg_batch:.1f} "
+            f"max_depth={self.max_depth} put_wait={self.put_wait:.3f}s"
+        )
+
+
+class WorkerPool:
+    """
+    Обмежена черга + workers споживачів.
+
+    handler отримує список від 1 до batch_size елементів. Якщо черга
+    заповнена, put() чекає — продюсери не можуть "затопити" пам'ять.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list], Awaitable],
+        workers: int = 4,
+        maxsize: int = 100,
+        batch_size: int = 1,
+        batch_timeout: float = 0.01,
+        name: str = "stage",
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.queue = BatchQueue(maxsize)
+        self.metrics = StageMetrics(name)
+        self.tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self.metrics.started = perf_counter()
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def put(self, item) -> None:
+        start = perf_counter()
+        await self.queue.put(item)
+        self.metrics.put_wait += perf_counter() - start
+        self.metrics.put += 1
+        self.metrics.max_depth = max(self.metrics.max_depth, self.queue.qsize())
+
+    async def close(self) -> None:
+        """Дочікується обробки всього, що вже в черзі, і зупиняє воркерів."""
+        for _ in self.tasks:
+            await self.queue.put(STOP)
+        await asyncio.gather(*self.tasks)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self.queue.get_many(self.batch_size, self.batch_timeout)
+            items = [item for item in batch if item is not STOP]
+            pills = len(batch) - len(items)
+            if items:
+                try:
+                    await self.handler(items)
+                    self.metrics.processed += len(items)
+                except Exception as err:
+                    self.metrics.errors += len(items)
+                    logging.error(f"[{self.metrics.name}] {err!r}")
+                self.metrics.batches += 1
+            for _ in batch:
+                self.queue.task_done()
+            if pills:
+                # Зайві "пігулки" з цієї порції належать іншим воркерам
+                for _ in range(pills - 1):
+                    await self.queue.put(STOP)
+                return